@@ -1,10 +1,24 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 
 from .models import Job
 
 
+class JobChangeList(ChangeList):
+    def get_queryset(self, request, *args, **kwargs):
+        # The changelist never renders the JSON columns; the change form still loads them.
+        qs = super().get_queryset(request, *args, **kwargs)
+        return qs.defer("input_payload", "output_result")
+
+
 @admin.register(Job)
 class JobAdmin(admin.ModelAdmin):
     list_display = ("id", "label", "status", "stage", "tenant", "created_at")
     list_filter = ("status", "stage", "tenant")
     search_fields = ("id", "label", "tenant__username")
+    list_select_related = ("tenant",)
+    list_per_page = 50
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return JobChangeList
@@ -1,13 +1,29 @@
 from django.db import migrations
 from django.db.models import F
 
+BATCH_SIZE = 30000
+
 
 def backfill_last_ran(apps, schema_editor):
     Job = apps.get_model("jobs", "Job")
-    Job.objects.filter(last_ran_at__isnull=True).update(last_ran_at=F("updated_at"))
+    pending = Job.objects.filter(last_ran_at__isnull=True).order_by("pk")
+    last_pk = None
+    while True:
+        batch = pending if last_pk is None else pending.filter(pk__gt=last_pk)
+        ids = list(batch.values_list("pk", flat=True)[:BATCH_SIZE])
+        if not ids:
+            break
+        Job.objects.filter(
+            last_ran_at__isnull=True, pk__gte=ids[0], pk__lte=ids[-1]
+        ).update(last_ran_at=F("updated_at"))
+        last_pk = ids[-1]
 
 
 class Migration(migrations.Migration):
+    # Each batch commits on its own so locks and WAL stay bounded and an
+    # interrupted run resumes from the rows still missing last_ran_at.
+    atomic = False
+
     dependencies = [
         ("jobs", "0002_job_last_ran_at"),
     ]
@@ -0,0 +1,51 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0007_add_idempotency_key_constraint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobEvent",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "type",
+                    models.CharField(
+                        choices=[
+                            ("SUBMITTED", "Submitted"),
+                            ("LEASED", "Leased"),
+                            ("PROGRESS_UPDATED", "Progress Updated"),
+                            ("RETRY_SCHEDULED", "Retry Scheduled"),
+                            ("THROTTLED", "Throttled"),
+                            ("FAILED", "Failed"),
+                            ("MOVED_TO_DLQ", "Moved to DLQ"),
+                            ("DONE", "Done"),
+                        ],
+                        max_length=32,
+                    ),
+                ),
+                ("metadata", models.JSONField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="events_rel",
+                        to="jobs.job",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["created_at", "id"],
+                "indexes": [
+                    models.Index(fields=["job", "created_at"], name="jobs_je_job_created_idx"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,60 @@
+from django.db import migrations
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+JOB_CHUNK_SIZE = 2000
+EVENT_BATCH_SIZE = 5000
+
+
+def copy_events(apps, schema_editor):
+    Job = apps.get_model("jobs", "Job")
+    JobEvent = apps.get_model("jobs", "JobEvent")
+    batch = []
+    jobs = Job.objects.values_list("id", "events").iterator(chunk_size=JOB_CHUNK_SIZE)
+    for job_id, events in jobs:
+        for event in events or []:
+            if not isinstance(event, dict) or not event.get("type"):
+                continue
+            created_at = parse_datetime(str(event.get("timestamp") or "")) or timezone.now()
+            batch.append(
+                JobEvent(
+                    job_id=job_id,
+                    type=event["type"],
+                    metadata=event.get("metadata") or None,
+                    created_at=created_at,
+                )
+            )
+            if len(batch) >= EVENT_BATCH_SIZE:
+                JobEvent.objects.bulk_create(batch)
+                batch = []
+    if batch:
+        JobEvent.objects.bulk_create(batch)
+
+
+def restore_events(apps, schema_editor):
+    Job = apps.get_model("jobs", "Job")
+    JobEvent = apps.get_model("jobs", "JobEvent")
+    # Stream in job order so only one job's events are held in memory at a time.
+    ordered = JobEvent.objects.order_by("job_id", "created_at", "id")
+    job_id, events = None, []
+    for event in ordered.iterator(chunk_size=EVENT_BATCH_SIZE):
+        if event.job_id != job_id:
+            if events:
+                Job.objects.filter(id=job_id).update(events=events)
+            job_id, events = event.job_id, []
+        entry = {"type": event.type, "timestamp": event.created_at.isoformat()}
+        if event.metadata:
+            entry["metadata"] = event.metadata
+        events.append(entry)
+    if events:
+        Job.objects.filter(id=job_id).update(events=events)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("jobs", "0008_jobevent"),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_events, restore_events),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0009_backfill_jobevent"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="job",
+            name="events",
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_remove_job_events'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['tenant', 'status', 'next_run_at'], name='jobs_job_tenant_due_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_job_tenant__b114ab_idx',
+        ),
+    ]
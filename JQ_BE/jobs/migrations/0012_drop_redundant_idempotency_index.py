@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:32
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_job_tenant_status_next_run_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_job_tenant__5f331d_idx',
+        ),
+    ]
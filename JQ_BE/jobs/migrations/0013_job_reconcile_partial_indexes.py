@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_drop_redundant_idempotency_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'PENDING')), fields=['updated_at'], name='jobs_job_pending_upd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'THROTTLED')), fields=['next_run_at'], name='jobs_job_throttled_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'FAILED')), fields=['next_retry_at'], name='jobs_job_failed_retry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'RUNNING')), fields=['lease_until'], name='jobs_job_running_lease_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0013_job_reconcile_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobInput',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='input', serialize=False, to='jobs.job')),
+                ('rows', models.JSONField(default=list)),
+            ],
+        ),
+    ]
@@ -2,7 +2,7 @@ import uuid
 
 from django.conf import settings
 from django.db import models
-from django.db.models import Q
+from django.db.models import Count, Min, Q, prefetch_related_objects
 from django.utils import timezone
 
 
@@ -59,16 +59,35 @@ class Job(models.Model):
     idempotency_key = models.CharField(max_length=64, null=True, blank=True)
     input_payload = models.JSONField(default=dict, blank=True)
     output_result = models.JSONField(default=dict, blank=True)
-    events = models.JSONField(default=list, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     last_ran_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         indexes = [
-            models.Index(fields=["tenant", "status"]),
+            models.Index(fields=["tenant", "status", "next_run_at"], name="jobs_job_tenant_due_idx"),
             models.Index(fields=["created_at"]),
-            models.Index(fields=["tenant", "idempotency_key"], name="jobs_job_tenant__5f331d_idx"),
+            # Partial indexes for reconcile's per-status scans; each only holds rows in that status.
+            models.Index(
+                fields=["updated_at"],
+                name="jobs_job_pending_upd_idx",
+                condition=Q(status=JobStatus.PENDING),
+            ),
+            models.Index(
+                fields=["next_run_at"],
+                name="jobs_job_throttled_due_idx",
+                condition=Q(status=JobStatus.THROTTLED),
+            ),
+            models.Index(
+                fields=["next_retry_at"],
+                name="jobs_job_failed_retry_idx",
+                condition=Q(status=JobStatus.FAILED),
+            ),
+            models.Index(
+                fields=["lease_until"],
+                name="jobs_job_running_lease_idx",
+                condition=Q(status=JobStatus.RUNNING),
+            ),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -79,18 +98,85 @@ class Job(models.Model):
         ]
 
     def add_event(self, event_type: str, metadata: dict | None = None) -> None:
-        event = {
-            "type": event_type,
-            "timestamp": timezone.now().isoformat(),
-        }
-        if metadata:
-            event["metadata"] = metadata
-        self.events = [*self.events, event]
+        """Queue an event; it is INSERTed into JobEvent on the next save()."""
+        if not hasattr(self, "_pending_events"):
+            self._pending_events = []
+        self._pending_events.append(
+            JobEvent(
+                job=self,
+                type=event_type,
+                metadata=metadata or None,
+                created_at=timezone.now(),
+            )
+        )
+
+    @property
+    def events(self) -> list[dict]:
+        persisted = []
+        if not self._state.adding:
+            # Loaded once per instance; save() drops the cache after appending.
+            prefetch_related_objects([self], "events_rel")
+            persisted = self.events_rel.all()
+        pending = getattr(self, "_pending_events", [])
+        return [event.as_dict() for event in [*persisted, *pending]]
+
+    def save(self, *args, **kwargs) -> None:
+        super().save(*args, **kwargs)
+        self.save_events()
+
+    def save_events(self) -> None:
+        """INSERT queued events without rewriting the job row."""
+        pending = getattr(self, "_pending_events", None)
+        if pending:
+            JobEvent.objects.bulk_create(pending)
+            self._pending_events = []
+            getattr(self, "_prefetched_objects_cache", {}).pop("events_rel", None)
+
+    def load_input_payload(self) -> dict:
+        """input_payload with its rows, fetched from JobInput when stored there (CSV uploads)."""
+        payload = self.input_payload or {}
+        if "rows" in payload:
+            return payload
+        rows = JobInput.objects.filter(job_id=self.pk).values_list("rows", flat=True).first()
+        if rows is None:
+            return payload
+        return {**payload, "rows": rows}
 
     def __str__(self) -> str:
         return f"{self.label} ({self.id})"
 
 
+class JobInput(models.Model):
+    """Uploaded rows kept off the job row, so job reads don't carry the whole file."""
+    job = models.OneToOneField(
+        Job, on_delete=models.CASCADE, primary_key=True, related_name="input"
+    )
+    rows = models.JSONField(default=list)
+
+
+class JobEvent(models.Model):
+    """Append-only job event log. One row per add_event; never rewritten."""
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="events_rel")
+    type = models.CharField(max_length=32, choices=JobEventType.choices)
+    metadata = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ["created_at", "id"]
+        indexes = [
+            models.Index(fields=["job", "created_at"], name="jobs_je_job_created_idx"),
+        ]
+
+    def as_dict(self) -> dict:
+        event = {
+            "type": self.type,
+            "timestamp": self.created_at.isoformat(),
+        }
+        if self.metadata:
+            event["metadata"] = self.metadata
+        return event
+
+
 class JobTrigger(models.Model):
     """One row per job run/trigger (create, retry, replay). Used for jobs-per-minute count."""
     job = models.ForeignKey(
@@ -105,3 +191,10 @@ class JobTrigger(models.Model):
         indexes = [
             models.Index(fields=["tenant", "triggered_at"], name="jobs_jt_tenant_trigger_idx"),
         ]
+
+    @classmethod
+    def window_usage(cls, tenant, since) -> dict:
+        """Trigger count and oldest trigger time for a tenant since `since`, in one query."""
+        return cls.objects.filter(tenant=tenant, triggered_at__gte=since).aggregate(
+            used=Count("id"), oldest=Min("triggered_at")
+        )
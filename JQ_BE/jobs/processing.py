@@ -1,12 +1,42 @@
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping
 import json
 import logging
+import re
 
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
 
 logger = logging.getLogger(__name__)
 
+# Plain dot-atom addresses on an ASCII domain. Everything this matches is also
+# accepted by validate_email, which remains the fallback for all other values.
+_EMAIL_RE = re.compile(
+    r"[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+)*"
+    r"@(?:[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?\.)+[A-Za-z]{2,63}"
+)
+_EMAIL_MAX_LENGTH = 320
+_MISSING = object()
+_FIELD_KEY_CACHE_SIZE = 1024
+# outputData is a preview; only this many valid rows are kept per job.
+_OUTPUT_PREVIEW_ROWS = 50
+_field_key_cache: dict[str, str] = {}
+# The raw config keys _build_config reads; only these form the cache key.
+_CONFIG_KEYS = (
+    "requiredFields",
+    "required_fields",
+    "dedupeOn",
+    "dedupe_on",
+    "dropNulls",
+    "drop_nulls",
+    "strictMode",
+    "strict_mode",
+    "numericField",
+    "numeric_field",
+)
+_CONFIG_CACHE_SIZE = 256
+_config_cache: dict[tuple, Mapping[str, Any]] = {}
+
 
 def _normalize_list(value: Any) -> list[str]:
     if value is None:
@@ -43,12 +73,49 @@ def _normalize_bool(value: Any, default: bool = False) -> bool:
     return bool(value)
 
 def _normalize_field_key(value: Any) -> str:
-    return str(value).strip().lstrip("\ufeff").lower()
-
-
-def _extract_config(payload: Any) -> dict:
+    # Rows repeat the same handful of schema keys, so this is almost always a hit.
+    try:
+        return _field_key_cache[value]
+    except (KeyError, TypeError):
+        pass
+    normalized = str(value).strip().lstrip("\ufeff").lower()
+    if type(value) is str:
+        # Keys come from uploads; start over rather than stop caching once full.
+        if len(_field_key_cache) >= _FIELD_KEY_CACHE_SIZE:
+            _field_key_cache.clear()
+        _field_key_cache[value] = normalized
+    return normalized
+
+
+def _freeze(value: Any) -> tuple:
+    # Tag each value with its type so 1, 1.0 and True stay distinct keys.
+    if isinstance(value, list):
+        return (list, tuple(_freeze(item) for item in value))
+    return (type(value), value)
+
+
+def _extract_config(payload: Any) -> Mapping[str, Any]:
     config = payload.get("config") if isinstance(payload, dict) else {}
     config = config if isinstance(config, dict) else {}
+    # Jobs from the same template share a config; the parsed result is shared
+    # too, so it is read-only and its field lists are tuples.
+    try:
+        config_key = tuple(
+            (name, _freeze(config[name])) for name in _CONFIG_KEYS if name in config
+        )
+        return _config_cache[config_key]
+    except KeyError:
+        pass
+    except TypeError:
+        # Nested dicts are unhashable; such configs are parsed per job.
+        return MappingProxyType(_build_config(config))
+    if len(_config_cache) >= _CONFIG_CACHE_SIZE:
+        _config_cache.clear()
+    parsed = _config_cache[config_key] = MappingProxyType(_build_config(config))
+    return parsed
+
+
+def _build_config(config: dict) -> dict:
     required_fields = _normalize_list(
         config.get("requiredFields") or config.get("required_fields")
     )
@@ -60,8 +127,8 @@ def _extract_config(payload: Any) -> dict:
         config.get("strictMode", config.get("strict_mode")), default=False
     )
     numeric_field = config.get("numericField") or config.get("numeric_field")
-    required_fields = [_normalize_field_key(field) for field in required_fields]
-    dedupe_on = [_normalize_field_key(field) for field in dedupe_on]
+    required_fields = tuple(_normalize_field_key(field) for field in required_fields)
+    dedupe_on = tuple(_normalize_field_key(field) for field in dedupe_on)
     if isinstance(numeric_field, str):
         numeric_field = _normalize_field_key(numeric_field)
     return {
@@ -74,29 +141,29 @@ def _extract_config(payload: Any) -> dict:
 
 
 def _is_null(value: Any) -> bool:
-    if value is None:
-        return True
-    if isinstance(value, str) and value.strip() == "":
-        return True
-    return False
+    # isspace() answers "blank?" without allocating a stripped copy.
+    return value is None or (
+        isinstance(value, str) and (not value or value.isspace())
+    )
 
 
-def _get_value_case_insensitive(row: dict, field: str) -> Any:
-    if field in row:
-        return row.get(field)
-    field_lower = _normalize_field_key(field)
-    for key, value in row.items():
-        if _normalize_field_key(key) == field_lower:
-            return value
-    return None
+def _normalize_row(row: dict) -> dict:
+    """Map normalised keys to values once per row.
 
-
-def _row_has_field(row: dict, field: str) -> bool:
-    field_lower = _normalize_field_key(field)
-    for key in row.keys():
-        if _normalize_field_key(key) == field_lower:
-            return True
-    return False
+    An exact key wins, otherwise the first key that normalises to the same name.
+    Rows whose keys are already normalised are returned as-is; callers only read.
+    """
+    for key in row:
+        if _normalize_field_key(key) != key:
+            break
+    else:
+        return row
+    row_lc = {}
+    for key, value in row.items():
+        normalized = _normalize_field_key(key)
+        if normalized not in row_lc or key == normalized:
+            row_lc[normalized] = value
+    return row_lc
 
 
 def _is_valid_email(value: Any) -> bool:
@@ -105,8 +172,10 @@ def _is_valid_email(value: Any) -> bool:
     if not isinstance(value, str):
         value = str(value)
     value = value.strip()
-    if not value:
+    if not value or "@" not in value:
         return False
+    if len(value) <= _EMAIL_MAX_LENGTH and _EMAIL_RE.fullmatch(value):
+        return True
     try:
         validate_email(value)
     except ValidationError:
@@ -132,62 +201,81 @@ def _is_valid_name(value: Any) -> bool:
     return len(value.strip()) > 2
 
 
-def _passes_basic_validation(row: dict) -> bool:
-    email_value = _get_value_case_insensitive(row, "email")
-    if email_value is not None and not _is_valid_email(email_value):
-        return False
-    if _row_has_field(row, "email") and not _is_valid_email(
-        _get_value_case_insensitive(row, "email")
-    ):
+def _passes_basic_validation(row_lc: dict) -> bool:
+    """Validate email/age/name on a row from _normalize_row; absent fields are skipped."""
+    email_value = row_lc.get("email", _MISSING)
+    if email_value is not _MISSING and not _is_valid_email(email_value):
         return False
-    if _row_has_field(row, "age") and not _is_valid_age(
-        _get_value_case_insensitive(row, "age")
-    ):
+    age_value = row_lc.get("age", _MISSING)
+    if age_value is not _MISSING and not _is_valid_age(age_value):
         return False
-    if _row_has_field(row, "name") and not _is_valid_name(
-        _get_value_case_insensitive(row, "name")
-    ):
+    name_value = row_lc.get("name", _MISSING)
+    if name_value is not _MISSING and not _is_valid_name(name_value):
         return False
     return True
 
 
-def _process_rows(rows: list, config: dict) -> dict:
+def _process_rows(rows: list, config: Mapping[str, Any], retain_limit: int = _OUTPUT_PREVIEW_ROWS) -> dict:
     required_fields = config.get("required_fields", [])
     dedupe_on = config.get("dedupe_on", [])
     drop_nulls = config.get("drop_nulls", False)
     strict_mode = config.get("strict_mode", False)
     required_set = set(required_fields)
+    # Null scans are only needed for strict mode, or drop_nulls when no
+    # required fields narrow the check; decide once instead of per row.
+    scan_nulls = strict_mode or (drop_nulls and not required_fields)
+    numeric_field = config.get("numeric_field")
+    numeric_key = _normalize_field_key(numeric_field) if numeric_field else None
+    # Single-field dedupe (the common case) keys `seen` by the string itself.
+    dedupe_field = dedupe_on[0] if len(dedupe_on) == 1 else None
     seen = set()
 
     valid_rows = []
+    valid_count = 0
+    numeric_values = []
     invalid_rows = 0
     nulls_dropped = 0
     duplicates_removed = 0
-    
-    logger.info(f"=== DEBUG _process_rows config: required_fields={required_fields}, dedupe_on={dedupe_on}, drop_nulls={drop_nulls}, strict_mode={strict_mode} ===")
+    # Per-row diagnostics are costly to build; decide once whether anyone listens.
+    debug_rows = logger.isEnabledFor(logging.DEBUG)
+    if debug_rows:
+        logger.debug(
+            "_process_rows config: required_fields=%s dedupe_on=%s drop_nulls=%s strict_mode=%s",
+            required_fields,
+            dedupe_on,
+            drop_nulls,
+            strict_mode,
+        )
 
     for idx, row in enumerate(rows):
         if not isinstance(row, dict):
-            logger.info(f"Row {idx}: INVALID - not a dict, type={type(row)}")
+            if debug_rows:
+                logger.debug("Row %s: INVALID - not a dict, type=%s", idx, type(row))
             invalid_rows += 1
             continue
 
-        row_keys_lower = {_normalize_field_key(key) for key in row.keys()}
+        row_lc = _normalize_row(row)
         if required_fields:
-            missing_required = [
-                field for field in required_fields if field.lower() not in row_keys_lower
-            ]
-            if missing_required:
-                logger.info(f"Row {idx}: INVALID - missing required fields: {missing_required}, row_keys_lower={row_keys_lower}")
+            if not row_lc.keys() >= required_set:
+                if debug_rows:
+                    logger.debug(
+                        "Row %s: INVALID - missing required fields: %s, row_keys_lower=%s",
+                        idx,
+                        [field for field in required_fields if field not in row_lc],
+                        set(row_lc),
+                    )
                 invalid_rows += 1
                 continue
             missing_values = [
-                field
-                for field in required_fields
-                if _is_null(_get_value_case_insensitive(row, field))
+                field for field in required_fields if _is_null(row_lc[field])
             ]
             if missing_values:
-                logger.info(f"Row {idx}: INVALID - null values in required fields: {missing_values}")
+                if debug_rows:
+                    logger.debug(
+                        "Row %s: INVALID - null values in required fields: %s",
+                        idx,
+                        missing_values,
+                    )
                 if drop_nulls:
                     nulls_dropped += 1
                 invalid_rows += 1
@@ -195,63 +283,80 @@ def _process_rows(rows: list, config: dict) -> dict:
 
         # Strict mode: enforce that ALL fields in the row have non-null values
         # (not just required fields). This is stricter data quality enforcement.
-        if strict_mode:
-            has_any_null = any(_is_null(value) for value in row.values())
-            if has_any_null:
-                logger.info(f"Row {idx}: INVALID - strict mode, row contains null/empty values")
-                invalid_rows += 1
-                continue
-
-        if drop_nulls and not required_fields:
-            has_nulls = any(_is_null(value) for value in row.values())
-            if has_nulls:
-                logger.info(f"Row {idx}: INVALID - drop_nulls enabled and row has null values")
+        # A row that passes strict mode has no nulls, so drop_nulls can share the scan.
+        if scan_nulls and any(map(_is_null, row.values())):
+            if strict_mode:
+                if debug_rows:
+                    logger.debug("Row %s: INVALID - strict mode, row contains null/empty values", idx)
+            else:
+                if debug_rows:
+                    logger.debug("Row %s: INVALID - drop_nulls enabled and row has null values", idx)
                 nulls_dropped += 1
-                invalid_rows += 1
-                continue
+            invalid_rows += 1
+            continue
 
-        if not _passes_basic_validation(row):
-            # More detailed logging for basic validation
-            email_val = _get_value_case_insensitive(row, "email")
-            age_val = _get_value_case_insensitive(row, "age")
-            name_val = _get_value_case_insensitive(row, "name")
-            logger.info(f"Row {idx}: INVALID - basic validation failed. email={email_val!r} valid={_is_valid_email(email_val)}, age={age_val!r} valid={_is_valid_age(age_val)}, name={name_val!r} valid={_is_valid_name(name_val)}")
+        if not _passes_basic_validation(row_lc):
+            if debug_rows:
+                # Re-running the validators is only worth it when someone reads the result.
+                email_val = row_lc.get("email")
+                age_val = row_lc.get("age")
+                name_val = row_lc.get("name")
+                logger.debug(
+                    "Row %s: INVALID - basic validation failed. email=%r valid=%s, age=%r valid=%s, name=%r valid=%s",
+                    idx,
+                    email_val,
+                    _is_valid_email(email_val),
+                    age_val,
+                    _is_valid_age(age_val),
+                    name_val,
+                    _is_valid_name(name_val),
+                )
             invalid_rows += 1
             continue
 
         if dedupe_on:
-            key = tuple(
-                str(_get_value_case_insensitive(row, field) or "") for field in dedupe_on
-            )
+            if dedupe_field is not None:
+                key = str(row_lc.get(dedupe_field) or "")
+            else:
+                key = tuple(str(row_lc.get(field) or "") for field in dedupe_on)
             if key in seen:
                 duplicates_removed += 1
                 continue
             seen.add(key)
 
-        valid_rows.append(row)
+        valid_count += 1
+        if valid_count <= retain_limit:
+            valid_rows.append(row)
+        if numeric_key is not None:
+            number = _coerce_number(row_lc.get(numeric_key))
+            if number is not None:
+                numeric_values.append(number)
 
     return {
         "valid_rows": valid_rows,
+        "valid_count": valid_count,
+        "numeric_stats": (
+            _compute_numeric_stats(numeric_values, numeric_field)
+            if numeric_key is not None
+            else None
+        ),
         "invalid_rows": invalid_rows,
         "duplicates_removed": duplicates_removed,
         "nulls_dropped": nulls_dropped,
     }
 
 
-def _compute_numeric_stats(rows: list, numeric_field: str) -> dict | None:
-    values = []
-    for row in rows:
-        if not isinstance(row, dict):
-            continue
-        value = _get_value_case_insensitive(row, numeric_field)
-        if isinstance(value, (int, float)):
-            values.append(value)
-        else:
-            try:
-                parsed = float(value)
-            except (TypeError, ValueError):
-                continue
-            values.append(parsed)
+def _coerce_number(value: Any) -> int | float | None:
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _compute_numeric_stats(values: list, numeric_field: str) -> dict | None:
+    """Aggregate the numbers _process_rows coerced from valid rows."""
     if not values:
         return None
     total = sum(values)
@@ -269,29 +374,21 @@ def build_output_result(payload: Any) -> dict:
     rows = rows if isinstance(rows, list) else []
     config = _extract_config(payload)
     total_processed = len(rows)
-    
-    # DEBUG: Log payload structure
-    logger.info("=== DEBUG build_output_result ===")
-    logger.info(f"payload type: {type(payload)}")
-    logger.info(f"payload keys: {list(payload.keys()) if isinstance(payload, dict) else 'N/A'}")
-    logger.info(f"raw config from payload: {payload.get('config') if isinstance(payload, dict) else 'N/A'}")
-    logger.info(f"parsed config: {config}")
-    logger.info(f"total rows: {len(rows)}")
-    if rows:
-        first_row = rows[0]
-        logger.info(f"first row type: {type(first_row)}")
-        logger.info(f"first row keys: {list(first_row.keys()) if isinstance(first_row, dict) else 'N/A'}")
-        logger.info(f"first row data: {first_row}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "build_output_result payload_keys=%s raw_config=%s parsed_config=%s rows=%s",
+            list(payload.keys()) if isinstance(payload, dict) else None,
+            payload.get("config") if isinstance(payload, dict) else None,
+            config,
+            total_processed,
+        )
+        if rows:
+            logger.debug("first row: %r", rows[0])
     processed = _process_rows(rows, config)
-    numeric_field = config.get("numeric_field")
-    numeric_stats = (
-        _compute_numeric_stats(processed["valid_rows"], numeric_field)
-        if numeric_field
-        else None
-    )
+    numeric_stats = processed["numeric_stats"]
     output = {
         "totalProcessed": total_processed,
-        "totalValid": len(processed["valid_rows"]),
+        "totalValid": processed["valid_count"],
         "totalInvalid": processed["invalid_rows"],
         "duplicatesRemoved": processed["duplicates_removed"],
         "nullsDropped": processed["nulls_dropped"],
@@ -299,5 +396,5 @@ def build_output_result(payload: Any) -> dict:
     if numeric_stats:
         output["numericStats"] = numeric_stats
     if processed["valid_rows"]:
-        output["outputData"] = processed["valid_rows"][:50]
+        output["outputData"] = processed["valid_rows"]
     return output
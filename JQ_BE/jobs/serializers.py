@@ -32,6 +32,38 @@ class JobSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class JobDetailSerializer(JobSerializer):
+    """Single-job responses; input_payload includes rows kept in JobInput (CSV uploads)."""
+
+    input_payload = serializers.SerializerMethodField()
+
+    def get_input_payload(self, obj):
+        return obj.load_input_payload()
+
+
+class JobWorkerSerializer(serializers.ModelSerializer):
+    """Job state echoed to worker callbacks; omits the payload, result and event log."""
+
+    class Meta:
+        model = Job
+        fields = [
+            "id",
+            "status",
+            "stage",
+            "progress",
+            "processed_rows",
+            "total_rows",
+            "attempts",
+            "max_attempts",
+            "locked_by",
+            "lease_until",
+            "next_retry_at",
+            "failure_reason",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
 class JobCreateSerializer(serializers.Serializer):
     INPUT_MODES = (("json", "json"), ("csv", "csv"))
 
@@ -5,18 +5,26 @@ reconcile re-enqueues THROTTLED jobs when next_run_at <= now.
 import logging
 import random
 import time
+from contextlib import contextmanager
 from datetime import timedelta
 
 from celery import shared_task
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.db import OperationalError, connection, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.lookups import LessThan
 from django.utils import timezone
 
-from .models import Job, JobEventType, JobStage, JobStatus
+from .models import Job, JobEvent, JobEventType, JobStage, JobStatus, JobTrigger
 from .processing import build_output_result
 
 logger = logging.getLogger(__name__)
 
+# Postgres advisory lock key held for the duration of a reconcile run.
+_RECONCILE_LOCK_ID = 0x6A6F6273
+
 
 def _lease_seconds() -> int:
     return int(getattr(settings, "JOB_LEASE_SECONDS", 60))
@@ -31,10 +39,10 @@ def _pending_timeout_seconds() -> int:
     return int(getattr(settings, "JOB_PENDING_TIMEOUT_SECONDS", 10))
 
 
-def _row_delay_seconds(payload: dict) -> float:
+def _json_row_delay_range() -> tuple[float, float]:
     delay_min = float(getattr(settings, "JOB_JSON_ROW_DELAY_MIN_SECONDS", 2))
     delay_max = float(getattr(settings, "JOB_JSON_ROW_DELAY_MAX_SECONDS", 3))
-    return random.uniform(delay_min, delay_max)
+    return delay_min, delay_max
 
 
 def _csv_batch_delay_settings(total_rows: int | None) -> tuple[int, float]:
@@ -52,6 +60,19 @@ def _csv_batch_delay_settings(total_rows: int | None) -> tuple[int, float]:
     return batch_size, max(delay, 0.0)
 
 
+def _abort_poll_seconds() -> float:
+    return float(getattr(settings, "JOB_ABORT_POLL_SECONDS", 1.0))
+
+
+def _progress_min_interval_seconds() -> float:
+    return float(getattr(settings, "JOB_PROGRESS_MIN_INTERVAL_SECONDS", 1.0))
+
+
+def _is_aborted(job_id) -> bool:
+    status = Job.objects.filter(id=job_id).values_list("status", flat=True).first()
+    return status != JobStatus.RUNNING
+
+
 def _csv_progress_update_every(total_rows: int) -> int:
     updates_target = int(getattr(settings, "JOB_CSV_PROGRESS_UPDATES", 100))
     updates_target = max(updates_target, 1)
@@ -67,7 +88,21 @@ def _should_delay_rows(payload: dict) -> bool:
     if payload.get("csv_meta"):
         _batch_size, batch_delay = _csv_batch_delay_settings(len(rows))
         return batch_delay > 0
-    return True
+    # With no per-row delay configured the simulated loop would only poll the DB.
+    return _json_row_delay_range()[1] > 0
+
+
+# Columns _mark_failed touches, plus the attempts counter callers bump alongside it.
+_FAILED_FIELDS = [
+    "attempts",
+    "status",
+    "stage",
+    "failure_reason",
+    "locked_by",
+    "lease_until",
+    "next_retry_at",
+    "updated_at",
+]
 
 
 def _mark_failed(job, reason: str, now, retry_in_seconds: int) -> None:
@@ -80,6 +115,11 @@ def _mark_failed(job, reason: str, now, retry_in_seconds: int) -> None:
     job.add_event(JobEventType.FAILED, {"reason": reason, "attempt": job.attempts})
 
 
+def _locked_retry_delay(attempt: int) -> float:
+    # Jittered exponential backoff so workers contending on a locked SQLite file spread out.
+    return min(5.0, random.uniform(0.05, 0.05 * 3 ** (attempt + 1)))
+
+
 def _save_with_retry(job, update_fields=None, attempts: int = 3) -> None:
     for attempt in range(attempts):
         try:
@@ -93,7 +133,7 @@ def _save_with_retry(job, update_fields=None, attempts: int = 3) -> None:
                     pass
             if "database is locked" not in str(exc).lower() or attempt >= attempts - 1:
                 raise
-            time.sleep(0.2 * (attempt + 1))
+            time.sleep(_locked_retry_delay(attempt))
 
 
 def _update_with_retry(qs, updates: dict, attempts: int = 3) -> int:
@@ -108,67 +148,162 @@ def _update_with_retry(qs, updates: dict, attempts: int = 3) -> int:
                     pass
             if "database is locked" not in str(exc).lower() or attempt >= attempts - 1:
                 raise
-            time.sleep(0.2 * (attempt + 1))
+            time.sleep(_locked_retry_delay(attempt))
     return 0
 
 
-@shared_task(name="jobs.proc")
+def _lock_tenant(job_id) -> None:
+    """Serialise leases per tenant so concurrent workers cannot both pass the RUNNING count."""
+    list(
+        get_user_model()
+        .objects.select_for_update(of=("self",))
+        .filter(jobs__id=job_id)
+        .values_list("pk", flat=True)
+    )
+
+
+def _try_lease(job_id, now) -> bool:
+    """Lease a runnable job with one conditional UPDATE; False leaves it to the locked path."""
+    leasable = Job.objects.filter(
+        Q(status=JobStatus.PENDING)
+        | Q(status=JobStatus.THROTTLED)
+        & (Q(next_run_at__isnull=True) | Q(next_run_at__lte=now)),
+        id=job_id,
+        attempts__lt=F("max_attempts"),
+    )
+    concurrent_limit = getattr(settings, "CONCURRENT_JOBS_LIMIT", 2)
+    if concurrent_limit:
+        running = (
+            Job.objects.filter(tenant=OuterRef("tenant"), status=JobStatus.RUNNING)
+            .order_by()
+            .values("tenant")
+            .annotate(n=Count("id"))
+            .values("n")
+        )
+        leasable = leasable.filter(
+            LessThan(Coalesce(Subquery(running), 0), concurrent_limit)
+        )
+    return bool(
+        _update_with_retry(
+            leasable,
+            {
+                "status": JobStatus.RUNNING,
+                "stage": JobStage.PROCESSING,
+                "progress": Greatest(F("progress"), 5),
+                # 5% of total_rows, as the locked path computes it.
+                "processed_rows": Greatest(F("processed_rows"), F("total_rows") / 20),
+                "locked_by": "celery-worker",
+                "last_ran_at": now,
+                "lease_until": now + timedelta(seconds=_lease_seconds()),
+                "next_run_at": None,
+                "updated_at": now,
+            },
+        )
+    )
+
+
+def _lease_locked(job_id, now) -> tuple[Job, dict | None]:
+    """Re-check a job _try_lease declined under a row lock.
+
+    Returns the job and None once it is leased, or the proc result when it is not.
+    """
+    # output_result is only written at the end of a run; leasing never reads it.
+    job = Job.objects.select_for_update().defer("output_result").get(id=job_id)
+    # Only process PENDING or THROTTLED (and for THROTTLED, caller/reconcile ensures next_run_at <= now)
+    # Nothing changes on these paths, so there is nothing to write back.
+    if job.status not in (JobStatus.PENDING, JobStatus.THROTTLED):
+        return job, {"status": job.status}
+    if job.status == JobStatus.THROTTLED and job.next_run_at and job.next_run_at > now:
+        return job, {"status": job.status}
+    if job.attempts >= job.max_attempts:
+        job.status = JobStatus.DLQ
+        job.add_event(JobEventType.MOVED_TO_DLQ, {"reason": job.failure_reason})
+        _save_with_retry(job, update_fields=["status", "updated_at"])
+        return job, {"status": job.status}
+
+    concurrent_limit = getattr(settings, "CONCURRENT_JOBS_LIMIT", 2)
+    if concurrent_limit:
+        running_now = (
+            Job.objects.filter(tenant=job.tenant, status=JobStatus.RUNNING)
+            .exclude(id=job.id)
+            .count()
+        )
+        if running_now >= concurrent_limit:
+            backoff = _throttle_backoff_seconds(job.throttle_count)
+            job.status = JobStatus.THROTTLED
+            job.next_run_at = now + timedelta(seconds=backoff)
+            job.throttle_count = (job.throttle_count or 0) + 1
+            job.locked_by = None
+            job.lease_until = None
+            job.add_event(
+                JobEventType.THROTTLED,
+                {
+                    "next_run_at": job.next_run_at.isoformat(),
+                    "throttle_count": job.throttle_count,
+                },
+            )
+            _save_with_retry(
+                job,
+                update_fields=[
+                    "status",
+                    "next_run_at",
+                    "throttle_count",
+                    "locked_by",
+                    "lease_until",
+                    "updated_at",
+                ],
+            )
+            return job, {
+                "status": JobStatus.THROTTLED,
+                "next_run_at": job.next_run_at.isoformat(),
+            }
+
+    job.status = JobStatus.RUNNING
+    job.stage = JobStage.PROCESSING
+    job.progress = max(job.progress, 5)
+    job.processed_rows = max(
+        job.processed_rows,
+        int(job.total_rows * 0.05) if job.total_rows else 0,
+    )
+    job.locked_by = "celery-worker"
+    job.last_ran_at = now
+    job.lease_until = now + timedelta(seconds=_lease_seconds())
+    job.next_run_at = None
+    job.add_event(JobEventType.LEASED, {"worker": job.locked_by})
+    job.add_event(JobEventType.PROGRESS_UPDATED, {"progress": job.progress})
+    _save_with_retry(
+        job,
+        update_fields=[
+            "status",
+            "stage",
+            "progress",
+            "processed_rows",
+            "locked_by",
+            "last_ran_at",
+            "lease_until",
+            "next_run_at",
+            "updated_at",
+        ],
+    )
+    return job, None
+
+
+@shared_task(name="jobs.proc", ignore_result=True)
 def proc(job_id: str) -> dict:
     now = timezone.now()
     with transaction.atomic():
-        job = Job.objects.select_for_update().get(id=job_id)
-        # Only process PENDING or THROTTLED (and for THROTTLED, caller/reconcile ensures next_run_at <= now)
-        if job.status not in (JobStatus.PENDING, JobStatus.THROTTLED):
-            _save_with_retry(job)
-            return {"status": job.status}
-        if job.status == JobStatus.THROTTLED and job.next_run_at and job.next_run_at > now:
-            _save_with_retry(job)
-            return {"status": job.status}
-        if job.attempts >= job.max_attempts:
-            job.status = JobStatus.DLQ
-            job.add_event(JobEventType.MOVED_TO_DLQ, {"reason": job.failure_reason})
-            _save_with_retry(job)
-            return {"status": job.status}
-
-        concurrent_limit = getattr(settings, "CONCURRENT_JOBS_LIMIT", 2)
-        if concurrent_limit:
-            running_now = (
-                Job.objects.filter(tenant=job.tenant, status=JobStatus.RUNNING)
-                .exclude(id=job.id)
-                .count()
-            )
-            if running_now >= concurrent_limit:
-                backoff = _throttle_backoff_seconds(job.throttle_count)
-                job.status = JobStatus.THROTTLED
-                job.next_run_at = now + timedelta(seconds=backoff)
-                job.throttle_count = (job.throttle_count or 0) + 1
-                job.locked_by = None
-                job.lease_until = None
-                job.add_event(
-                    JobEventType.THROTTLED,
-                    {
-                        "next_run_at": job.next_run_at.isoformat(),
-                        "throttle_count": job.throttle_count,
-                    },
-                )
-                _save_with_retry(job)
-                return {"status": JobStatus.THROTTLED, "next_run_at": job.next_run_at.isoformat()}
-
-        job.status = JobStatus.RUNNING
-        job.stage = JobStage.PROCESSING
-        job.progress = max(job.progress, 5)
-        job.processed_rows = max(
-            job.processed_rows,
-            int(job.total_rows * 0.05) if job.total_rows else 0,
-        )
-        job.locked_by = "celery-worker"
-        job.last_ran_at = now
-        job.lease_until = now + timedelta(seconds=_lease_seconds())
-        job.next_run_at = None
-        job.add_event(JobEventType.LEASED, {"worker": job.locked_by})
-        job.add_event(JobEventType.PROGRESS_UPDATED, {"progress": job.progress})
-        payload = job.input_payload or {}
-        _save_with_retry(job)
+        if getattr(settings, "CONCURRENT_JOBS_LIMIT", 2):
+            _lock_tenant(job_id)
+        if _try_lease(job_id, now):
+            job = Job.objects.defer("output_result").get(id=job_id)
+            job.add_event(JobEventType.LEASED, {"worker": job.locked_by})
+            job.add_event(JobEventType.PROGRESS_UPDATED, {"progress": job.progress})
+            job.save_events()
+        else:
+            job, declined = _lease_locked(job_id, now)
+            if declined:
+                return declined
+        payload = job.load_input_payload()
         logger.info(
             "proc start job=%s status=%s attempts=%s rows=%s",
             job.id,
@@ -184,49 +319,66 @@ def proc(job_id: str) -> dict:
             batch_size = None
             batch_delay = None
             progress_every = 1
-            abort_check_every = 1
-            if payload.get("csv_meta"):
+            is_csv = bool(payload.get("csv_meta"))
+            if is_csv:
                 batch_size, batch_delay = _csv_batch_delay_settings(total_rows)
                 progress_every = _csv_progress_update_every(total_rows)
-                abort_check_every = progress_every
+            else:
+                delay_min, delay_max = _json_row_delay_range()
+                # A fixed delay needs no random draw per row.
+                fixed_delay = delay_min if delay_min == delay_max else None
+            # Poll for aborts by wall-clock time rather than per row.
+            abort_poll_seconds = _abort_poll_seconds()
+            last_abort_check = time.monotonic()
+            progress_interval = _progress_min_interval_seconds()
+            lease_extension = timedelta(seconds=_lease_seconds())
+            # Last progress written by this loop; the `job` snapshot is not updated by it.
+            last_progress = job.progress
+            last_progress_write = float("-inf")
             for index in range(total_rows):
                 processed = index + 1
-                if payload.get("csv_meta"):
-                    if processed % abort_check_every == 0:
-                        if not Job.objects.filter(
-                            id=job_id, status=JobStatus.RUNNING
-                        ).exists():
-                            return {"status": "ABORTED"}
+                now_mono = time.monotonic()
+                if now_mono - last_abort_check >= abort_poll_seconds:
+                    last_abort_check = now_mono
+                    if _is_aborted(job_id):
+                        return {"status": "ABORTED"}
+                if is_csv:
                     if batch_delay and processed % batch_size == 0:
                         time.sleep(batch_delay)
                 else:
-                    if not Job.objects.filter(id=job_id, status=JobStatus.RUNNING).exists():
-                        return {"status": "ABORTED"}
-                    delay = _row_delay_seconds(payload)
+                    delay = (
+                        fixed_delay
+                        if fixed_delay is not None
+                        else random.uniform(delay_min, delay_max)
+                    )
                     if delay > 0:
                         time.sleep(delay)
                 should_update = True
-                if payload.get("csv_meta"):
+                if is_csv:
                     should_update = processed % progress_every == 0 or processed == total_rows
+                if should_update and processed < total_rows:
+                    # Coalesce progress writes that would land closer together than the interval.
+                    should_update = time.monotonic() - last_progress_write >= progress_interval
                 if should_update:
-                    progress = min(
-                        99,
-                        max(job.progress, int((processed / max(total_rows, 1)) * 95)),
-                    )
+                    progress = min(99, max(last_progress, int(processed / total_rows * 95)))
+                    last_progress = progress
+                    ts = timezone.now()
                     _update_with_retry(
                         Job.objects.filter(id=job_id),
                         {
                             "processed_rows": processed,
                             "progress": progress,
                             "stage": JobStage.PROCESSING,
-                            "lease_until": timezone.now() + timedelta(seconds=_lease_seconds()),
-                            "updated_at": timezone.now(),
+                            "lease_until": ts + lease_extension,
+                            "updated_at": ts,
                         },
                     )
+                    last_progress_write = time.monotonic()
 
         output_result = build_output_result(payload)
         with transaction.atomic():
-            job = Job.objects.select_for_update().get(id=job_id)
+            # The payload was already read at lease time; don't decode/re-encode it again.
+            job = Job.objects.select_for_update().defer("input_payload").get(id=job_id)
             if job.status != JobStatus.RUNNING:
                 return {"status": job.status}
             job.status = JobStatus.DONE
@@ -238,7 +390,20 @@ def proc(job_id: str) -> dict:
             job.lease_until = None
             job.next_run_at = None
             job.add_event(JobEventType.DONE)
-            _save_with_retry(job)
+            _save_with_retry(
+                job,
+                update_fields=[
+                    "status",
+                    "stage",
+                    "progress",
+                    "processed_rows",
+                    "output_result",
+                    "locked_by",
+                    "lease_until",
+                    "next_run_at",
+                    "updated_at",
+                ],
+            )
         logger.info(
             "proc done job=%s total=%s valid=%s invalid=%s duplicates=%s nulls=%s",
             job_id,
@@ -252,13 +417,17 @@ def proc(job_id: str) -> dict:
     except Exception as exc:
         retry_in = int(getattr(settings, "JOB_RETRY_DELAY_SECONDS", 5))
         with transaction.atomic():
-            job = Job.objects.select_for_update().get(id=job_id)
+            job = (
+                Job.objects.select_for_update()
+                .defer("input_payload", "output_result")
+                .get(id=job_id)
+            )
             job.attempts += 1
             _mark_failed(job, str(exc), timezone.now(), retry_in)
             if job.attempts >= job.max_attempts:
                 job.status = JobStatus.DLQ
                 job.add_event(JobEventType.MOVED_TO_DLQ, {"reason": job.failure_reason})
-            _save_with_retry(job)
+            _save_with_retry(job, update_fields=_FAILED_FIELDS)
         logger.exception(
             "proc failed job=%s status=%s attempts=%s reason=%s",
             job_id,
@@ -269,178 +438,244 @@ def proc(job_id: str) -> dict:
         raise
 
 
-@shared_task(name="jobs.reconcile")
+def _fail_stuck_jobs(candidates, reason: str, now, retry_in: int) -> tuple[list, list]:
+    """Fail up to 50 stuck jobs in bulk, as _mark_failed would; exhausted jobs go to the DLQ.
+
+    Returns (failed, dlq) as lists of (job id, attempts after the increment).
+    """
+    with transaction.atomic():
+        rows = list(
+            candidates.select_for_update(skip_locked=True).values_list(
+                "id", "attempts", "max_attempts"
+            )[:50]
+        )
+        failed = [(jid, attempts + 1) for jid, attempts, limit in rows if attempts + 1 < limit]
+        dlq = [(jid, attempts + 1) for jid, attempts, limit in rows if attempts + 1 >= limit]
+        changes = {
+            "attempts": F("attempts") + 1,
+            "stage": JobStage.VALIDATING,
+            "failure_reason": reason,
+            "locked_by": None,
+            "lease_until": None,
+            "next_retry_at": now + timedelta(seconds=retry_in),
+            "updated_at": now,
+        }
+        for batch, status in ((failed, JobStatus.FAILED), (dlq, JobStatus.DLQ)):
+            if batch:
+                _update_with_retry(
+                    candidates.order_by().filter(id__in=[jid for jid, _ in batch]),
+                    {**changes, "status": status},
+                )
+        events = [
+            JobEvent(
+                job_id=jid,
+                type=JobEventType.FAILED,
+                metadata={"reason": reason, "attempt": attempts},
+            )
+            for jid, attempts in failed + dlq
+        ]
+        events += [
+            JobEvent(job_id=jid, type=JobEventType.MOVED_TO_DLQ, metadata={"reason": reason})
+            for jid, _ in dlq
+        ]
+        JobEvent.objects.bulk_create(events)
+    return failed, dlq
+
+
+def _enqueue_proc(job_ids) -> None:
+    """Publish proc for each job over one broker producer instead of one per delay()."""
+    if not job_ids:
+        return
+    with proc.app.producer_or_acquire() as producer:
+        for jid in job_ids:
+            proc.apply_async((str(jid),), producer=producer)
+
+
+@contextmanager
+def _reconcile_lock():
+    """Yield whether this run may reconcile; only one run at a time holds it on Postgres."""
+    if connection.vendor != "postgresql":
+        yield True
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_lock(%s)", [_RECONCILE_LOCK_ID])
+        acquired = cursor.fetchone()[0]
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", [_RECONCILE_LOCK_ID])
+
+
+def _prune_triggers(now) -> int:
+    """Delete up to 5000 JobTrigger rows past retention; only the last minute is ever read."""
+    retention = int(getattr(settings, "JOB_TRIGGER_RETENTION_SECONDS", 3600))
+    stale = list(
+        JobTrigger.objects.filter(triggered_at__lt=now - timedelta(seconds=retention))
+        .order_by("triggered_at")
+        .values_list("pk", flat=True)[:5000]
+    )
+    if not stale:
+        return 0
+    deleted, _ = JobTrigger.objects.filter(pk__in=stale).delete()
+    return deleted
+
+
+@shared_task(name="jobs.reconcile", ignore_result=True)
 def reconcile() -> dict:
-    """Re-enqueue THROTTLED/FAILED jobs; fail timed-out PENDING; recover lease-expired RUNNING."""
+    """Re-enqueue THROTTLED/FAILED jobs; fail timed-out PENDING; recover lease-expired RUNNING.
+
+    Each bucket is handled with a few bulk statements; rows a worker holds are
+    skipped and picked up on the next tick. Overlapping runs skip instead of
+    repeating the same scans.
+    """
+    with _reconcile_lock() as acquired:
+        if not acquired:
+            logger.info("reconcile: another run holds the lock, skipping")
+            return {"skipped": True}
+        return _reconcile_buckets()
+
+
+def _reconcile_buckets() -> dict:
     now = timezone.now()
-    from django.db.models import Q
+    retry_in = int(getattr(settings, "JOB_RETRY_DELAY_SECONDS", 5))
 
     pending_cutoff = now - timedelta(seconds=_pending_timeout_seconds())
     pending_ready = Job.objects.filter(
         status=JobStatus.PENDING, updated_at__lt=pending_cutoff
     ).order_by("updated_at")
-    pending_failed = 0
-    pending_to_dlq = 0
-    retry_in = int(getattr(settings, "JOB_RETRY_DELAY_SECONDS", 5))
-    for job in pending_ready[:50]:
-        jid = job.id
-        try:
-            job = Job.objects.filter(id=jid, status=JobStatus.PENDING).first()
-            if not job:
-                continue
-            job.attempts += 1
-            _mark_failed(job, "Pending timeout", now, retry_in)
-            if job.attempts >= job.max_attempts:
-                job.status = JobStatus.DLQ
-                job.add_event(
-                    JobEventType.MOVED_TO_DLQ, {"reason": job.failure_reason}
-                )
-                pending_to_dlq += 1
-                logger.info(
-                    "reconcile: pending timeout -> DLQ job=%s attempts=%s",
-                    jid,
-                    job.attempts,
-                )
-            _save_with_retry(job)
-            pending_failed += 1
-            if job.status == JobStatus.FAILED:
-                logger.info(
-                    "reconcile: pending timeout -> FAILED job=%s attempts=%s next_retry_at=%s",
-                    jid,
-                    job.attempts,
-                    job.next_retry_at,
-                )
-        except OperationalError:
-            continue
+    try:
+        pending_failed, pending_dlq = _fail_stuck_jobs(
+            pending_ready, "Pending timeout", now, retry_in
+        )
+    except OperationalError:
+        pending_failed, pending_dlq = [], []
+    for jid, attempts in pending_dlq:
+        logger.info("reconcile: pending timeout -> DLQ job=%s attempts=%s", jid, attempts)
+    for jid, attempts in pending_failed:
+        logger.info(
+            "reconcile: pending timeout -> FAILED job=%s attempts=%s next_retry_at=%s",
+            jid,
+            attempts,
+            now + timedelta(seconds=retry_in),
+        )
 
     throttled_ready = Job.objects.filter(status=JobStatus.THROTTLED).filter(
         Q(next_run_at__isnull=True) | Q(next_run_at__lte=now)
     )
-    requeued = 0
-    for job in throttled_ready[:50]:
-        jid = job.id
-        try:
-            job = Job.objects.filter(id=jid, status=JobStatus.THROTTLED).first()
-            if not job:
-                continue
-            if job.next_run_at and job.next_run_at > now:
-                continue
-            job.status = JobStatus.PENDING
-            job.next_run_at = None
-            _save_with_retry(job, update_fields=["status", "next_run_at", "updated_at"])
-            proc.delay(str(jid))
-            requeued += 1
-            logger.info("reconcile: requeued throttled job=%s", jid)
-        except OperationalError:
-            continue
+    try:
+        with transaction.atomic():
+            throttled_ids = list(
+                throttled_ready.select_for_update(skip_locked=True).values_list(
+                    "id", flat=True
+                )[:50]
+            )
+            if throttled_ids:
+                _update_with_retry(
+                    throttled_ready.filter(id__in=throttled_ids),
+                    {"status": JobStatus.PENDING, "next_run_at": None, "updated_at": now},
+                )
+    except OperationalError:
+        throttled_ids = []
+    for jid in throttled_ids:
+        logger.info("reconcile: requeued throttled job=%s", jid)
 
     failed_ready = Job.objects.filter(status=JobStatus.FAILED).filter(
         Q(next_retry_at__lte=now) | Q(next_retry_at__isnull=True)
     )
-    failed_requeued = 0
-    failed_to_dlq = 0
-    for job in failed_ready[:50]:
-        jid = job.id
-        try:
-            job = Job.objects.filter(id=jid, status=JobStatus.FAILED).first()
-            if not job:
-                continue
-            if job.next_retry_at and job.next_retry_at > now:
-                continue
-            if job.attempts >= job.max_attempts:
-                job.status = JobStatus.DLQ
-                job.add_event(JobEventType.MOVED_TO_DLQ, {"reason": job.failure_reason})
-                job.next_retry_at = None
-                job.next_run_at = None
-                _save_with_retry(
-                    job,
-                    update_fields=[
-                        "status",
-                        "next_retry_at",
-                        "next_run_at",
-                        "events",
-                        "updated_at",
-                    ],
+    try:
+        with transaction.atomic():
+            rows = list(
+                failed_ready.select_for_update(skip_locked=True).values_list(
+                    "id", "attempts", "max_attempts", "failure_reason"
+                )[:50]
+            )
+            retry = [(jid, attempts) for jid, attempts, limit, _ in rows if attempts < limit]
+            exhausted = [
+                (jid, attempts, reason) for jid, attempts, limit, reason in rows if attempts >= limit
+            ]
+            if exhausted:
+                _update_with_retry(
+                    failed_ready.filter(id__in=[jid for jid, _, _ in exhausted]),
+                    {
+                        "status": JobStatus.DLQ,
+                        "next_retry_at": None,
+                        "next_run_at": None,
+                        "updated_at": now,
+                    },
                 )
-                failed_to_dlq += 1
-                logger.info(
-                    "reconcile: failed -> DLQ job=%s attempts=%s",
-                    jid,
-                    job.attempts,
+            if retry:
+                _update_with_retry(
+                    failed_ready.filter(id__in=[jid for jid, _ in retry]),
+                    {
+                        "status": JobStatus.PENDING,
+                        "stage": JobStage.VALIDATING,
+                        "progress": 0,
+                        "processed_rows": 0,
+                        "next_retry_at": None,
+                        "next_run_at": None,
+                        "locked_by": None,
+                        "lease_until": None,
+                        "updated_at": now,
+                    },
                 )
-                continue
-            job.status = JobStatus.PENDING
-            job.stage = JobStage.VALIDATING
-            job.progress = 0
-            job.processed_rows = 0
-            job.next_retry_at = None
-            job.next_run_at = None
-            job.locked_by = None
-            job.lease_until = None
-            job.add_event(
-                JobEventType.RETRY_SCHEDULED,
-                {"reason": "Auto retry", "queued_at": now.isoformat()},
-            )
-            _save_with_retry(
-                job,
-                update_fields=[
-                    "status",
-                    "stage",
-                    "progress",
-                    "processed_rows",
-                    "next_retry_at",
-                    "next_run_at",
-                    "locked_by",
-                    "lease_until",
-                    "events",
-                    "updated_at",
-                ],
-            )
-            proc.delay(str(jid))
-            failed_requeued += 1
-            logger.info(
-                "reconcile: requeued failed job=%s attempts=%s",
-                jid,
-                job.attempts,
+            JobEvent.objects.bulk_create(
+                [
+                    JobEvent(
+                        job_id=jid,
+                        type=JobEventType.MOVED_TO_DLQ,
+                        metadata={"reason": reason},
+                    )
+                    for jid, _, reason in exhausted
+                ]
+                + [
+                    JobEvent(
+                        job_id=jid,
+                        type=JobEventType.RETRY_SCHEDULED,
+                        metadata={"reason": "Auto retry", "queued_at": now.isoformat()},
+                    )
+                    for jid, _ in retry
+                ]
             )
-        except OperationalError:
-            continue
+    except OperationalError:
+        retry, exhausted = [], []
+    for jid, attempts, _ in exhausted:
+        logger.info("reconcile: failed -> DLQ job=%s attempts=%s", jid, attempts)
+    for jid, attempts in retry:
+        logger.info("reconcile: requeued failed job=%s attempts=%s", jid, attempts)
+    _enqueue_proc([*throttled_ids, *(jid for jid, _ in retry)])
 
     expired = Job.objects.filter(
         status=JobStatus.RUNNING,
         lease_until__isnull=False,
         lease_until__lt=now,
     )
-    failed_count = 0
-    retry_in = int(getattr(settings, "JOB_RETRY_DELAY_SECONDS", 5))
-    for job in expired[:50]:
-        jid = job.id
-        try:
-            job = Job.objects.filter(id=jid, status=JobStatus.RUNNING).first()
-            if not job or not job.lease_until or job.lease_until >= now:
-                continue
-            job.attempts += 1
-            _mark_failed(job, "Worker lease expired", now, retry_in)
-            if job.attempts >= job.max_attempts:
-                job.status = JobStatus.DLQ
-                job.add_event(JobEventType.MOVED_TO_DLQ, {"reason": job.failure_reason})
-            _save_with_retry(job)
-            failed_count += 1
+    try:
+        expired_failed, expired_dlq = _fail_stuck_jobs(
+            expired, "Worker lease expired", now, retry_in
+        )
+    except OperationalError:
+        expired_failed, expired_dlq = [], []
+    for status, batch in ((JobStatus.FAILED, expired_failed), (JobStatus.DLQ, expired_dlq)):
+        for jid, attempts in batch:
             logger.info(
-                "reconcile: lease expired -> %s job=%s attempts=%s",
-                job.status,
-                jid,
-                job.attempts,
+                "reconcile: lease expired -> %s job=%s attempts=%s", status, jid, attempts
             )
-        except OperationalError:
-            continue
 
+    try:
+        triggers_pruned = _prune_triggers(now)
+    except OperationalError:
+        triggers_pruned = 0
+
+    pending_total = len(pending_failed) + len(pending_dlq)
     return {
-        "requeued_pending": pending_failed,
-        "pending_failed": pending_failed,
-        "pending_to_dlq": pending_to_dlq,
-        "requeued_throttled": requeued,
-        "requeued_failed": failed_requeued,
-        "failed_to_dlq": failed_to_dlq,
-        "lease_expired_failed": failed_count,
+        "requeued_pending": pending_total,
+        "pending_failed": pending_total,
+        "pending_to_dlq": len(pending_dlq),
+        "requeued_throttled": len(throttled_ids),
+        "requeued_failed": len(retry),
+        "failed_to_dlq": len(exhausted),
+        "lease_expired_failed": len(expired_failed) + len(expired_dlq),
+        "triggers_pruned": triggers_pruned,
     }
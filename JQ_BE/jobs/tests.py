@@ -1,11 +1,22 @@
 """
-Minimal tests for tenant concurrency throttling (THROTTLED status).
+Minimal tests for tenant concurrency throttling (THROTTLED status), the job event log,
+row processing and the jobs API.
 """
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from rest_framework.test import APIClient
 
-from .models import Job, JobEventType, JobStage, JobStatus
+from .models import Job, JobEvent, JobEventType, JobStage, JobStatus, JobTrigger
+from . import processing
+from .processing import _extract_config, build_output_result
 from .tasks import proc, reconcile
 
 User = get_user_model()
@@ -94,3 +105,427 @@ class ThrottlingTests(TestCase):
         result = proc(str(j2.id))
         j2.refresh_from_db()
         self.assertEqual(j2.status, JobStatus.DONE, "Job should run once slot is free")
+
+    @override_settings(JOB_JSON_ROW_DELAY_MIN_SECONDS=0, JOB_JSON_ROW_DELAY_MAX_SECONDS=0)
+    def test_proc_leases_with_events(self):
+        job = Job.objects.create(
+            tenant=self.user,
+            label="lease",
+            total_rows=40,
+            input_payload={"rows": [{"name": "alice"}], "config": {}},
+        )
+        self.assertEqual(proc(str(job.id)), {"status": JobStatus.DONE})
+        job = Job.objects.get(id=job.id)
+        self.assertIsNotNone(job.last_ran_at)
+        self.assertEqual(
+            [(e["type"], e.get("metadata")) for e in job.events],
+            [
+                (JobEventType.LEASED, {"worker": "celery-worker"}),
+                (JobEventType.PROGRESS_UPDATED, {"progress": 5}),
+                (JobEventType.DONE, None),
+            ],
+        )
+
+    def test_proc_moves_exhausted_job_to_dlq(self):
+        job = Job.objects.create(
+            tenant=self.user, label="dlq", attempts=3, max_attempts=3, input_payload={}
+        )
+        self.assertEqual(proc(str(job.id)), {"status": JobStatus.DLQ})
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatus.DLQ)
+
+    def test_reconcile_requeues_only_due_throttled_jobs(self):
+        now = timezone.now()
+        due = [
+            Job.objects.create(
+                tenant=self.user,
+                label=f"due-{i}",
+                status=JobStatus.THROTTLED,
+                input_payload={},
+                next_run_at=now - timedelta(seconds=1) if i else None,
+            )
+            for i in range(2)
+        ]
+        later = Job.objects.create(
+            tenant=self.user,
+            label="later",
+            status=JobStatus.THROTTLED,
+            input_payload={},
+            next_run_at=now + timedelta(minutes=5),
+        )
+        with mock.patch("jobs.tasks.proc.apply_async") as apply_async:
+            result = reconcile()
+        self.assertEqual(result["requeued_throttled"], 2)
+        self.assertCountEqual(
+            [c.args[0] for c in apply_async.call_args_list], [(str(j.id),) for j in due]
+        )
+        for job in due:
+            job.refresh_from_db()
+            self.assertEqual(job.status, JobStatus.PENDING)
+            self.assertIsNone(job.next_run_at)
+        later.refresh_from_db()
+        self.assertEqual(later.status, JobStatus.THROTTLED)
+
+    @override_settings(JOB_TRIGGER_RETENTION_SECONDS=3600)
+    def test_reconcile_prunes_triggers_past_retention(self):
+        now = timezone.now()
+        JobTrigger.objects.create(tenant=self.user, triggered_at=now - timedelta(hours=2))
+        recent = JobTrigger.objects.create(tenant=self.user, triggered_at=now - timedelta(minutes=5))
+        result = reconcile()
+        self.assertEqual(result["triggers_pruned"], 1)
+        self.assertEqual(list(JobTrigger.objects.all()), [recent])
+
+    def test_reconcile_fails_expired_leases_and_retries_failed_jobs(self):
+        now = timezone.now()
+        expired = Job.objects.create(
+            tenant=self.user,
+            label="expired",
+            status=JobStatus.RUNNING,
+            lease_until=now - timedelta(seconds=5),
+            input_payload={},
+        )
+        exhausted = Job.objects.create(
+            tenant=self.user,
+            label="exhausted",
+            status=JobStatus.RUNNING,
+            lease_until=now - timedelta(seconds=5),
+            attempts=2,
+            max_attempts=3,
+            input_payload={},
+        )
+        failed = Job.objects.create(
+            tenant=self.user,
+            label="failed",
+            status=JobStatus.FAILED,
+            attempts=1,
+            progress=40,
+            next_retry_at=now - timedelta(seconds=1),
+            input_payload={},
+        )
+        with mock.patch("jobs.tasks.proc.apply_async") as apply_async:
+            result = reconcile()
+        self.assertEqual(result["lease_expired_failed"], 2)
+        self.assertEqual(result["requeued_failed"], 1)
+        apply_async.assert_called_once()
+        self.assertEqual(apply_async.call_args.args[0], (str(failed.id),))
+
+        expired.refresh_from_db()
+        self.assertEqual((expired.status, expired.attempts), (JobStatus.FAILED, 1))
+        self.assertEqual(expired.failure_reason, "Worker lease expired")
+        self.assertIsNone(expired.lease_until)
+        exhausted = Job.objects.get(id=exhausted.id)
+        self.assertEqual((exhausted.status, exhausted.attempts), (JobStatus.DLQ, 3))
+        self.assertEqual(
+            [e["type"] for e in exhausted.events],
+            [JobEventType.FAILED, JobEventType.MOVED_TO_DLQ],
+        )
+        failed = Job.objects.get(id=failed.id)
+        self.assertEqual((failed.status, failed.progress), (JobStatus.PENDING, 0))
+        self.assertEqual([e["type"] for e in failed.events], [JobEventType.RETRY_SCHEDULED])
+
+
+class JobEventTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="eventuser", password="testpass")
+
+    def test_add_event_appends_rows_on_save(self):
+        """Events are buffered until save() and then inserted as JobEvent rows in order."""
+        job = Job.objects.create(tenant=self.user, label="events", input_payload={})
+        job.add_event(JobEventType.SUBMITTED)
+        job.add_event(JobEventType.FAILED, {"reason": "boom", "attempt": 1})
+        self.assertEqual(JobEvent.objects.filter(job=job).count(), 0)
+        job.save()
+        self.assertEqual(JobEvent.objects.filter(job=job).count(), 2)
+        job = Job.objects.prefetch_related("events_rel").get(id=job.id)
+        self.assertEqual(
+            [e["type"] for e in job.events],
+            [JobEventType.SUBMITTED, JobEventType.FAILED],
+        )
+        self.assertEqual(job.events[1]["metadata"], {"reason": "boom", "attempt": 1})
+        self.assertNotIn("metadata", job.events[0])
+
+    def test_events_are_loaded_once_per_instance(self):
+        job = Job.objects.create(tenant=self.user, label="events", input_payload={})
+        job.add_event(JobEventType.SUBMITTED)
+        job.save()
+        job = Job.objects.get(id=job.id)
+        with self.assertNumQueries(1):
+            job.events
+            job.events
+        job.add_event(JobEventType.DONE)
+        job.save()
+        self.assertEqual(
+            [e["type"] for e in job.events], [JobEventType.SUBMITTED, JobEventType.DONE]
+        )
+
+
+class ProcessingTests(TestCase):
+    def test_basic_validation_and_dedupe(self):
+        rows = [
+            {"Name": "Alice", "Email": "alice@example.com", "Age": "30"},
+            {"Name": "Alice", "Email": "alice@example.com", "Age": "30"},
+            {"Name": "Bo", "Email": "bo@example.com", "Age": "20"},
+            {"Name": "Carol", "Email": "not-an-email", "Age": "40"},
+            {"Name": "Dave", "Email": "dave@example.com", "Age": "140"},
+            {"Name": "Erin", "Email": None},
+        ]
+        result = build_output_result({"rows": rows, "config": {"dedupeOn": "email"}})
+        self.assertEqual(result["totalProcessed"], 6)
+        self.assertEqual(result["totalValid"], 1)
+        self.assertEqual(result["totalInvalid"], 4)
+        self.assertEqual(result["duplicatesRemoved"], 1)
+        self.assertEqual(result["outputData"], [rows[0]])
+
+    def test_required_fields_strict_mode_and_drop_nulls(self):
+        rows = [
+            {"id": 1, "city": "Paris", "note": ""},
+            {"id": 2, "city": " "},
+            {"id": 3},
+            {"ID": 4, "City": "Rome"},
+        ]
+        config = {"requiredFields": ["id", "city"], "dropNulls": True}
+        result = build_output_result({"rows": rows, "config": config})
+        self.assertEqual(result["totalValid"], 2)
+        self.assertEqual(result["totalInvalid"], 2)
+        self.assertEqual(result["nullsDropped"], 1)
+
+        config["strictMode"] = True
+        result = build_output_result({"rows": rows, "config": config})
+        self.assertEqual(result["totalValid"], 1)
+        self.assertEqual(result["outputData"], [rows[3]])
+
+        result = build_output_result({"rows": rows, "config": {"dropNulls": "yes"}})
+        self.assertEqual(result["totalValid"], 2)
+        self.assertEqual(result["nullsDropped"], 2)
+
+    def test_jobs_with_equal_configs_do_not_share_mutable_config(self):
+        first = _extract_config({"config": {"requiredFields": ["id"], "dropNulls": True}})
+        with self.assertRaises(TypeError):
+            first["strict_mode"] = True
+        second = _extract_config({"config": {"dropNulls": True, "requiredFields": ["id"]}})
+        self.assertIs(second, first)
+        self.assertEqual(second["required_fields"], ("id",))
+        self.assertFalse(second["strict_mode"])
+        # 1 and True must not collide in the cache.
+        self.assertIs(_extract_config({"config": {"numericField": 1}})["numeric_field"], 1)
+        self.assertIs(_extract_config({"config": {"numericField": True}})["numeric_field"], True)
+
+    def test_field_key_cache_keeps_caching_after_filling_up(self):
+        with mock.patch.object(processing, "_FIELD_KEY_CACHE_SIZE", 2):
+            processing._field_key_cache.clear()
+            for key in ("A", "B", "C", " D "):
+                processing._normalize_field_key(key)
+            self.assertEqual(processing._field_key_cache, {"C": "c", " D ": "d"})
+
+    def test_output_data_is_capped_but_counts_are_not(self):
+        rows = [{"name": f"user-{i}"} for i in range(60)]
+        result = build_output_result({"rows": rows, "config": {}})
+        self.assertEqual(result["totalValid"], 60)
+        self.assertEqual(result["outputData"], rows[:50])
+
+    def test_numeric_stats(self):
+        rows = [{"Amount": 10}, {"amount": "2.5"}, {"amount": "n/a"}, {"other": 1}]
+        result = build_output_result({"rows": rows, "config": {"numericField": "AMOUNT"}})
+        self.assertEqual(
+            result["numericStats"],
+            {"field": "amount", "sum": 12.5, "avg": 6.25, "min": 2.5, "max": 10},
+        )
+
+
+@override_settings(JOBS_PER_MIN_LIMIT=2, CONCURRENT_JOBS_LIMIT=2)
+class JobApiTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="apiuser", password="testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        cache.clear()
+
+    def _create(self, label="job", **extra):
+        body = {"label": label, "input_mode": "json", "payload": {"rows": [{"a": 1}]}}
+        body.update(extra)
+        return self.client.post("/api/jobs/", body, format="json")
+
+    def test_jobs_per_minute_limit(self):
+        self.assertEqual(self._create().status_code, 201)
+        self.assertEqual(self._create().status_code, 201)
+        response = self._create()
+        self.assertEqual(response.status_code, 429)
+        self.assertFalse(response.json()["success"])
+        self.assertIn("Retry-After", response)
+
+    def test_jobs_per_minute_limit_uses_redis_window_when_configured(self):
+        script = mock.Mock(return_value=[0, str(timezone.now().timestamp() * 1000 - 45000)])
+        with mock.patch("jobs.views._rate_limit_script", return_value=script):
+            response = self._create()
+        self.assertEqual(response.status_code, 429)
+        self.assertLessEqual(int(response["Retry-After"]), 16)
+        self.assertEqual(script.call_args.kwargs["keys"], [f"rl:jobs:{self.user.id}"])
+        self.assertFalse(Job.objects.exists())
+
+    def test_list_query_count_does_not_grow_with_page(self):
+        for i in range(25):
+            job = Job.objects.create(tenant=self.user, label=f"job-{i}", total_rows=1)
+            job.add_event(JobEventType.SUBMITTED)
+            job.save_events()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/jobs/?page_size=25")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["data"]["items"]), 25)
+        self.assertLess(len(ctx.captured_queries), 5)
+
+        response = self.client.get("/api/jobs/?page_size=10&page=3")
+        data = response.json()["data"]
+        self.assertEqual((len(data["items"]), data["count"]), (5, 25))
+        self.assertEqual(data["items"][-1]["label"], "job-0")
+
+    def test_stats_counts_statuses_in_one_query(self):
+        Job.objects.create(tenant=self.user, label="a", status=JobStatus.RUNNING, attempts=1)
+        Job.objects.create(tenant=self.user, label="b", status=JobStatus.DLQ, attempts=3)
+        Job.objects.create(tenant=self.user, label="c")
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.client.get("/api/jobs/stats/").json()["data"]
+        self.assertEqual(len(ctx.captured_queries), 2)
+        self.assertEqual(data["totalJobs"], 3)
+        self.assertEqual((data["pending"], data["running"], data["dlq"], data["done"]), (1, 1, 1, 0))
+        self.assertEqual(data["concurrentJobs"], 1)
+        self.assertEqual(data["retries"], 4)
+
+    def test_stats_are_cached_until_a_write(self):
+        self.assertEqual(self.client.get("/api/jobs/stats/").json()["data"]["totalJobs"], 0)
+        Job.objects.create(tenant=self.user, label="direct")
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get("/api/jobs/stats/").json()["data"]["totalJobs"], 0)
+        self.assertEqual(len(ctx.captured_queries), 0)
+        with mock.patch("jobs.tasks.proc.delay"), self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self._create().status_code, 201)
+        self.assertEqual(self.client.get("/api/jobs/stats/").json()["data"]["totalJobs"], 2)
+
+    def test_create_from_csv_upload(self):
+        upload = SimpleUploadedFile("people.csv", "name,email\nAnn,a@x.io\nBjörn,b@x.io\n".encode())
+        with mock.patch("jobs.tasks.proc.delay"):
+            response = self.client.post(
+                "/api/jobs/", {"label": "csv", "input_mode": "csv", "csv_file": upload}
+            )
+        self.assertEqual(response.status_code, 201)
+        job = Job.objects.get()
+        self.assertEqual(job.total_rows, 2)
+        self.assertNotIn("rows", job.input_payload)
+        payload = job.load_input_payload()
+        self.assertEqual(payload["csv_meta"], {"filename": "people.csv", "row_count": 2})
+        self.assertEqual(payload["rows"][1], {"name": "Björn", "email": "b@x.io"})
+
+        job.status = JobStatus.RUNNING
+        job.save(update_fields=["status"])
+        response = self.client.post(f"/api/jobs/{job.id}/complete/", {}, format="json")
+        self.assertEqual(response.status_code, 200)
+        job.refresh_from_db()
+        self.assertEqual(job.output_result["totalProcessed"], 2)
+
+    def test_lease_claims_oldest_runnable_job_within_concurrency_limit(self):
+        first = Job.objects.create(tenant=self.user, label="first", total_rows=40)
+        Job.objects.create(tenant=self.user, label="second", total_rows=1)
+        response = self.client.post("/api/jobs/lease/", {"worker_id": "w1"}, format="json")
+        self.assertEqual(response.json()["data"]["id"], str(first.id))
+        first.refresh_from_db()
+        self.assertEqual((first.status, first.locked_by, first.processed_rows), (JobStatus.RUNNING, "w1", 2))
+        self.assertEqual(self.client.post("/api/jobs/lease/", {"worker_id": "w2"}, format="json").status_code, 200)
+        response = self.client.post("/api/jobs/lease/", {"worker_id": "w3"}, format="json")
+        self.assertEqual(response.status_code, 429)
+
+    def test_create_returns_job_inserted_concurrently_with_same_idempotency_key(self):
+        def concurrent_insert(user):
+            Job.objects.create(tenant=user, label="other", idempotency_key="k1")
+
+        with mock.patch("jobs.views._enforce_jobs_per_min_limit", side_effect=concurrent_insert):
+            response = self._create(idempotency_key="k1")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["label"], "other")
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_create_inserts_job_and_events_without_rewriting_job(self):
+        with mock.patch("jobs.tasks.proc.delay"), CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self._create().status_code, 201)
+        self.assertFalse(any(q["sql"].startswith('UPDATE "jobs_job"') for q in ctx.captured_queries))
+        self.assertEqual(
+            list(JobEvent.objects.values_list("type", flat=True)), [JobEventType.SUBMITTED]
+        )
+
+    def test_worker_callbacks_reply_without_payload(self):
+        job = Job.objects.create(
+            tenant=self.user, label="w", status=JobStatus.RUNNING, total_rows=1,
+            input_payload={"rows": [{"email": "a@x.io"}]},
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                f"/api/jobs/{job.id}/progress/", {"progress": 50, "processed_rows": 1}, format="json"
+            )
+        data = response.json()["data"]
+        self.assertEqual(data["progress"], 50)
+        self.assertNotIn("input_payload", data)
+        self.assertFalse(any("input_payload" in q["sql"] for q in ctx.captured_queries))
+
+        response = self.client.post(f"/api/jobs/{job.id}/complete/", {}, format="json")
+        self.assertEqual(response.json()["data"]["status"], JobStatus.DONE)
+        job.refresh_from_db()
+        self.assertEqual(job.output_result["totalValid"], 1)
+
+    def test_register_rejects_taken_username(self):
+        client = APIClient()
+        body = {"username": "newuser", "password": "c0rrect-horse-battery"}
+        self.assertEqual(client.post("/api/auth/register/", body, format="json").status_code, 201)
+        with mock.patch("django.contrib.auth.base_user.make_password") as make_password:
+            response = client.post("/api/auth/register/", body, format="json")
+        make_password.assert_not_called()
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("username already exists", str(response.json()["error"]))
+
+        # A sign-up that loses the race after the pre-check gets the same error.
+        with mock.patch("jobs.views.User.objects.filter") as filter_:
+            filter_.return_value.exists.return_value = False
+            response = client.post("/api/auth/register/", body, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("username already exists", str(response.json()["error"]))
+
+    def test_redis_slot_is_released_when_no_trigger_is_recorded(self):
+        def admit_after_concurrent_insert(keys, args):
+            Job.objects.create(tenant=self.user, label="other", idempotency_key="k2")
+            return [1, 0]
+
+        script = mock.Mock(side_effect=admit_after_concurrent_insert)
+        with mock.patch("jobs.views._rate_limit_script", return_value=script):
+            self.assertEqual(self._create(idempotency_key="k2").status_code, 200)
+        member = script.call_args.kwargs["args"][2]
+        script.registered_client.zrem.assert_called_once_with(f"rl:jobs:{self.user.id}", member)
+
+        script = mock.Mock(return_value=[1, 0])
+        with mock.patch("jobs.views._rate_limit_script", return_value=script), mock.patch(
+            "jobs.views.JobTrigger.objects.create", side_effect=RuntimeError("boom")
+        ), self.assertRaises(RuntimeError):
+            self._create()
+        member = script.call_args.kwargs["args"][2]
+        script.registered_client.zrem.assert_called_once_with(f"rl:jobs:{self.user.id}", member)
+
+        script = mock.Mock(return_value=[1, 0])
+        with mock.patch("jobs.views._rate_limit_script", return_value=script), mock.patch(
+            "jobs.tasks.proc.delay"
+        ):
+            self.assertEqual(self._create().status_code, 201)
+        script.registered_client.zrem.assert_not_called()
+
+    def test_lease_and_detail_return_csv_rows(self):
+        upload = SimpleUploadedFile("rows.csv", b"name,email\nAnn,a@x.io\n")
+        with mock.patch("jobs.tasks.proc.delay"):
+            created = self.client.post(
+                "/api/jobs/", {"label": "csv", "input_mode": "csv", "csv_file": upload}
+            ).json()["data"]
+        self.assertEqual(created["input_payload"]["rows"], [{"name": "Ann", "email": "a@x.io"}])
+
+        leased = self.client.post("/api/jobs/lease/", {"worker_id": "w1"}, format="json").json()["data"]
+        self.assertEqual(leased["id"], created["id"])
+        self.assertEqual(leased["input_payload"]["rows"], [{"name": "Ann", "email": "a@x.io"}])
+        self.assertEqual(leased["input_payload"]["csv_meta"]["row_count"], 1)
+
+        detail = self.client.get(f"/api/jobs/{created['id']}/").json()["data"]
+        self.assertEqual(detail["input_payload"]["rows"], [{"name": "Ann", "email": "a@x.io"}])
+        listed = self.client.get("/api/jobs/").json()["data"]["items"][0]
+        self.assertNotIn("rows", listed["input_payload"])
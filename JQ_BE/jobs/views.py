@@ -1,59 +1,203 @@
 import csv
 import io
+import json
 import logging
+import uuid
+from contextlib import contextmanager
 from datetime import timedelta
+from functools import lru_cache, partial
+
+import redis
 from django.contrib.auth import authenticate, get_user_model
 from django.contrib.auth.password_validation import validate_password
+from django.core.cache import cache
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import IntegrityError, transaction
-from django.db.models import Q, Sum
+from django.db.models import Count, Q, Sum
 from django.conf import settings
 from django.utils import timezone
 from rest_framework import exceptions, permissions, status, viewsets
+from rest_framework.authtoken.models import Token
 from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.decorators import action
 from rest_framework.views import APIView
 
-from .models import Job, JobEventType, JobStage, JobStatus, JobTrigger
+from .models import Job, JobEventType, JobInput, JobStage, JobStatus, JobTrigger
 from .processing import build_output_result
 from .responses import api_response
 from .serializers import (
     JobActionSerializer,
     JobCreateSerializer,
+    JobDetailSerializer,
     JobSerializer,
+    JobWorkerSerializer,
     WorkerCompleteSerializer,
     WorkerFailSerializer,
     WorkerLeaseSerializer,
     WorkerProgressSerializer,
 )
+from .tasks import proc
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
-def _enforce_jobs_per_min_limit(user) -> None:
-    """Enforce jobs-per-minute: count distinct triggers in the last minute (same job run twice = 2)."""
+# Sliding one-minute window per tenant: trim, count and record in one atomic call.
+# Returns {1, 0} when admitted, {0, oldest_ms} when the window is full.
+_RATE_LIMIT_LUA = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, tonumber(ARGV[1]) - 60000)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[2]) then
+    return {0, redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')[2]}
+end
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[3])
+redis.call('PEXPIRE', KEYS[1], 120000)
+return {1, 0}
+"""
+
+
+@lru_cache(maxsize=1)
+def _rate_limit_script():
+    """Registered sliding-window script, or None when JOBS_RATE_LIMIT_REDIS_URL is unset."""
+    url = getattr(settings, "JOBS_RATE_LIMIT_REDIS_URL", "")
+    if not url:
+        return None
+    return redis.Redis.from_url(url).register_script(_RATE_LIMIT_LUA)
+
+
+def _rate_limit_key(user) -> str:
+    return f"rl:jobs:{user.id}"
+
+
+def _redis_rate_limit_wait(script, user, limit: int, now, member: str) -> int | None:
+    """Seconds to wait if the Redis window is full, 0 if admitted, None if Redis is unavailable."""
+    now_ms = int(now.timestamp() * 1000)
+    try:
+        admitted, oldest_ms = script(keys=[_rate_limit_key(user)], args=[now_ms, limit, member])
+    except redis.RedisError:
+        logger.warning("rate limit redis unavailable, falling back to database user=%s", user.id)
+        return None
+    if admitted:
+        return 0
+    return max(1, int(60 - (now_ms - float(oldest_ms)) / 1000))
+
+
+def _enforce_jobs_per_min_limit(user) -> str | None:
+    """Enforce jobs-per-minute: count distinct triggers in the last minute (same job run twice = 2).
+
+    Returns the member recorded in the Redis window, or None when the database decided.
+    """
     limit = getattr(settings, "JOBS_PER_MIN_LIMIT", 4)
     if not limit:
-        return
+        return None
     now = timezone.now()
-    window_start = now - timedelta(minutes=1)
-    used = JobTrigger.objects.filter(tenant=user, triggered_at__gte=window_start).count()
-    if used < limit:
-        return
-    oldest = (
-        JobTrigger.objects.filter(tenant=user, triggered_at__gte=window_start)
-        .order_by("triggered_at")
-        .first()
-    )
-    wait = 60
-    if oldest and oldest.triggered_at:
-        wait = max(1, int(60 - (now - oldest.triggered_at).total_seconds()))
+    script = _rate_limit_script()
+    member = uuid.uuid4().hex
+    wait = _redis_rate_limit_wait(script, user, limit, now, member) if script else None
+    if wait is None:
+        usage = JobTrigger.window_usage(user, now - timedelta(minutes=1))
+        if usage["used"] < limit:
+            return None
+        wait = 60
+        if usage["oldest"]:
+            wait = max(1, int(60 - (now - usage["oldest"]).total_seconds()))
+    elif not wait:
+        return member
     raise exceptions.Throttled(
         wait=wait,
         detail=f"Rate limit exceeded: max {limit} job triggers per minute. Try again in ~{wait}s.",
     )
 
 
+def _release_rate_limit_slot(user, member: str | None) -> None:
+    """Take back a Redis window entry whose trigger was never recorded."""
+    if member is None:
+        return
+    try:
+        _rate_limit_script().registered_client.zrem(_rate_limit_key(user), member)
+    except redis.RedisError:
+        logger.warning("rate limit redis unavailable, slot not released user=%s", user.id)
+
+
+@contextmanager
+def _jobs_per_min_slot(user):
+    """Enforce the jobs-per-minute limit for one trigger.
+
+    The Redis slot is handed back if the block raises; the block calls the yielded
+    release() itself when it ends without recording a trigger.
+    """
+    member = _enforce_jobs_per_min_limit(user)
+    release = partial(_release_rate_limit_slot, user, member)
+    try:
+        yield release
+    except BaseException:
+        release()
+        raise
+
+
+# Columns each endpoint rewrites; saving only these keeps input_payload and
+# output_result out of the UPDATE.
+_RESET_FIELDS = [
+    "status",
+    "stage",
+    "progress",
+    "processed_rows",
+    "attempts",
+    "failure_reason",
+    "next_retry_at",
+    "next_run_at",
+    "locked_by",
+    "lease_until",
+    "last_ran_at",
+    "updated_at",
+]
+_LEASE_FIELDS = [
+    "status",
+    "stage",
+    "progress",
+    "processed_rows",
+    "locked_by",
+    "last_ran_at",
+    "lease_until",
+    "next_run_at",
+    "updated_at",
+]
+_PROGRESS_FIELDS = ["progress", "processed_rows", "stage", "updated_at"]
+_COMPLETE_FIELDS = [
+    "status",
+    "stage",
+    "progress",
+    "processed_rows",
+    "locked_by",
+    "lease_until",
+    "output_result",
+    "updated_at",
+]
+_FAIL_FIELDS = [
+    "attempts",
+    "failure_reason",
+    "status",
+    "stage",
+    "locked_by",
+    "lease_until",
+    "next_retry_at",
+    "next_run_at",
+    "updated_at",
+]
+
+
+# Worker callbacks reply with JobWorkerSerializer, so they skip the heavy columns and events.
+_WORKER_CALLBACKS = {"progress", "complete", "fail"}
+
+
+def _stats_cache_key(user_id, status_param: str) -> str:
+    return f"stats:{user_id}:{status_param}"
+
+
+def _invalidate_stats(user) -> None:
+    """Drop the tenant's cached stats (every status filter) once the write commits."""
+    keys = [_stats_cache_key(user.id, s) for s in ("", *JobStatus.values)]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
 def _throttle_backoff_seconds(throttle_count: int) -> int:
     base = int(getattr(settings, "JOB_THROTTLE_BACKOFF_SECONDS", 15))
     return min(base * (1 + max(throttle_count, 0)), 300)
@@ -65,18 +209,19 @@ def _parse_config(value):
     if isinstance(value, dict):
         return value
     try:
-        import json
-
         return json.loads(value)
     except (TypeError, ValueError):
         return {}
 
 
 def _parse_csv(file_obj):
-    decoded = file_obj.read().decode("utf-8")
-    reader = csv.DictReader(io.StringIO(decoded))
-    rows = list(reader)
-    return rows
+    """Decode the upload incrementally instead of holding the whole file as one str."""
+    text = io.TextIOWrapper(file_obj.file, encoding="utf-8", newline="")
+    try:
+        return list(csv.DictReader(text))
+    finally:
+        # Leave the upload open; Django closes it with the request.
+        text.detach()
 
 
 class AuthRegisterView(APIView):
@@ -92,6 +237,7 @@ class AuthRegisterView(APIView):
                 {"detail": "username and password are required."}
             )
 
+        # Cheap fast path: a taken name must not cost a password hash.
         if User.objects.filter(username=username).exists():
             raise exceptions.ValidationError({"detail": "username already exists."})
 
@@ -100,10 +246,14 @@ class AuthRegisterView(APIView):
         except DjangoValidationError as exc:
             raise exceptions.ValidationError({"password": exc.messages}) from exc
 
-        user = User.objects.create_user(username=username, email=email, password=password)
-        from rest_framework.authtoken.models import Token
-
-        token, _ = Token.objects.get_or_create(user=user)
+        # A concurrent sign-up can still win the race; the unique constraint decides.
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(username=username, email=email, password=password)
+        except IntegrityError as exc:
+            raise exceptions.ValidationError({"detail": "username already exists."}) from exc
+        # A brand-new user cannot have a token yet, so skip get_or_create's SELECT.
+        token = Token.objects.create(user=user)
         return api_response(
             {"token": token.key, "user": {"id": user.id, "username": user.username, "email": user.email}},
             status_code=status.HTTP_201_CREATED,
@@ -120,8 +270,6 @@ class AuthLoginView(APIView):
         if not user:
             raise exceptions.AuthenticationFailed("Invalid credentials.")
 
-        from rest_framework.authtoken.models import Token
-
         token, _ = Token.objects.get_or_create(user=user)
         return api_response(
             {"token": token.key, "user": {"id": user.id, "username": user.username, "email": user.email}}
@@ -140,6 +288,11 @@ class JobViewSet(viewsets.GenericViewSet):
 
     def get_queryset(self):
         qs = Job.objects.filter(tenant=self.request.user).order_by("-created_at")
+        if self.action in _WORKER_CALLBACKS:
+            # Answered with JobWorkerSerializer; complete() loads input_payload only when it needs it.
+            qs = qs.defer("input_payload", "output_result")
+        else:
+            qs = qs.prefetch_related("events_rel")
         status_param = self.request.query_params.get("status")
         if status_param:
             allowed = {s[0] for s in JobStatus.choices}
@@ -153,7 +306,7 @@ class JobViewSet(viewsets.GenericViewSet):
         return JobSerializer
 
     def list(self, request):
-        queryset = list(self.filter_queryset(self.get_queryset()))
+        queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
         serializer = JobSerializer(page if page is not None else queryset, many=True)
         if page is not None:
@@ -162,11 +315,12 @@ class JobViewSet(viewsets.GenericViewSet):
 
     def retrieve(self, request, pk=None):
         job = self.get_object()
-        return api_response(JobSerializer(job).data)
+        return api_response(JobDetailSerializer(job).data)
 
     def destroy(self, request, pk=None):
         job = self.get_object()
         job.delete()
+        _invalidate_stats(request.user)
         return api_response({"id": str(pk)})
 
     @transaction.atomic
@@ -177,11 +331,12 @@ class JobViewSet(viewsets.GenericViewSet):
         input_mode = data["input_mode"]
         payload = data.get("payload") or {}
 
+        csv_rows = None
         if input_mode == "csv":
             csv_rows = _parse_csv(data["csv_file"])
             config = _parse_config(request.data.get("config"))
+            # The rows go to JobInput; the job row keeps only config and file metadata.
             payload = {
-                "rows": csv_rows,
                 "config": config,
                 "csv_meta": {
                     "filename": data["csv_file"].name,
@@ -199,168 +354,188 @@ class JobViewSet(viewsets.GenericViewSet):
                 tenant=request.user, idempotency_key=idempotency_key
             ).first()
             if existing:
-                return api_response(JobSerializer(existing).data)
-
-        _enforce_jobs_per_min_limit(request.user)
-
-        concurrent_limit = getattr(settings, "CONCURRENT_JOBS_LIMIT", 2)
-        running_now = 0
-        if concurrent_limit:
-            running_now = Job.objects.filter(
-                tenant=request.user, status=JobStatus.RUNNING
-            ).count()
-        status_value = JobStatus.PENDING
-        next_run_at = None
-        throttle_count = 0
-        throttled_metadata = None
-        if concurrent_limit and running_now >= concurrent_limit:
-            backoff = _throttle_backoff_seconds(0)
-            status_value = JobStatus.THROTTLED
-            next_run_at = timezone.now() + timedelta(seconds=backoff)
-            throttle_count = 1
-            throttled_metadata = {
-                "next_run_at": next_run_at.isoformat(),
-                "throttle_count": throttle_count,
-            }
-
-        total_rows = len(payload.get("rows", []))
-        max_attempts = data.get("max_attempts") or 3
-
-        try:
-            job = Job.objects.create(
-                tenant=request.user,
-                label=data["label"],
-                status=status_value,
-                stage=JobStage.VALIDATING,
-                progress=0,
-                processed_rows=0,
-                total_rows=total_rows,
-                attempts=0,
-                max_attempts=max_attempts,
-                idempotency_key=idempotency_key or None,
-                input_payload=payload,
-                output_result={},
-                events=[],
-                last_ran_at=timezone.now(),
-                next_run_at=next_run_at,
-                throttle_count=throttle_count,
+                return api_response(JobDetailSerializer(existing).data)
+
+        with _jobs_per_min_slot(request.user) as release_slot:
+
+            concurrent_limit = getattr(settings, "CONCURRENT_JOBS_LIMIT", 2)
+            running_now = 0
+            if concurrent_limit:
+                running_now = Job.objects.filter(
+                    tenant=request.user, status=JobStatus.RUNNING
+                ).count()
+            status_value = JobStatus.PENDING
+            next_run_at = None
+            throttle_count = 0
+            throttled_metadata = None
+            if concurrent_limit and running_now >= concurrent_limit:
+                backoff = _throttle_backoff_seconds(0)
+                status_value = JobStatus.THROTTLED
+                next_run_at = timezone.now() + timedelta(seconds=backoff)
+                throttle_count = 1
+                throttled_metadata = {
+                    "next_run_at": next_run_at.isoformat(),
+                    "throttle_count": throttle_count,
+                }
+
+            total_rows = len(csv_rows if csv_rows is not None else payload.get("rows", []))
+            max_attempts = data.get("max_attempts") or 3
+
+            try:
+                # Savepoint: a concurrent insert with the same key must not abort create()'s transaction.
+                with transaction.atomic():
+                    job = Job.objects.create(
+                        tenant=request.user,
+                        label=data["label"],
+                        status=status_value,
+                        stage=JobStage.VALIDATING,
+                        progress=0,
+                        processed_rows=0,
+                        total_rows=total_rows,
+                        attempts=0,
+                        max_attempts=max_attempts,
+                        idempotency_key=idempotency_key or None,
+                        input_payload=payload,
+                        output_result={},
+                        last_ran_at=timezone.now(),
+                        next_run_at=next_run_at,
+                        throttle_count=throttle_count,
+                    )
+                    if csv_rows is not None:
+                        JobInput.objects.create(job=job, rows=csv_rows)
+            except IntegrityError:
+                if idempotency_key:
+                    existing = Job.objects.filter(
+                        tenant=request.user, idempotency_key=idempotency_key
+                    ).first()
+                    if existing:
+                        # No new trigger was recorded, so it must not use up a slot.
+                        release_slot()
+                        return api_response(JobDetailSerializer(existing).data)
+                raise
+            job.add_event(JobEventType.SUBMITTED)
+            if status_value == JobStatus.THROTTLED and throttled_metadata:
+                job.add_event(JobEventType.THROTTLED, throttled_metadata)
+            job.save_events()
+            _invalidate_stats(request.user)
+            JobTrigger.objects.create(tenant=request.user, job=job, triggered_at=timezone.now())
+            if job.status == JobStatus.PENDING:
+                transaction.on_commit(lambda: proc.delay(str(job.id)))
+            logger.info(
+                "job submitted id=%s status=%s rows=%s input_mode=%s user=%s next_run_at=%s",
+                job.id,
+                job.status,
+                total_rows,
+                input_mode,
+                request.user.id,
+                job.next_run_at,
             )
-        except IntegrityError:
-            if idempotency_key:
-                existing = Job.objects.filter(
-                    tenant=request.user, idempotency_key=idempotency_key
-                ).first()
-                if existing:
-                    return api_response(JobSerializer(existing).data)
-            raise
-        job.add_event(JobEventType.SUBMITTED)
-        if status_value == JobStatus.THROTTLED and throttled_metadata:
-            job.add_event(JobEventType.THROTTLED, throttled_metadata)
-        job.save()
-        JobTrigger.objects.create(tenant=request.user, job=job, triggered_at=timezone.now())
-        from .tasks import proc
-
-        if job.status == JobStatus.PENDING:
-            transaction.on_commit(lambda: proc.delay(str(job.id)))
-        logger.info(
-            "job submitted id=%s status=%s rows=%s input_mode=%s user=%s next_run_at=%s",
-            job.id,
-            job.status,
-            total_rows,
-            input_mode,
-            request.user.id,
-            job.next_run_at,
-        )
-        return api_response(JobSerializer(job).data, status_code=status.HTTP_201_CREATED)
+            return api_response(JobDetailSerializer(job).data, status_code=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=["post"])
     def retry(self, request, pk=None):
         job = self.get_object()
         if job.status not in {JobStatus.FAILED, JobStatus.DONE}:
             raise exceptions.ValidationError("Only failed or completed jobs can be retried.")
-        _enforce_jobs_per_min_limit(request.user)
-        previous_status = job.status
-        job.status = JobStatus.PENDING
-        job.stage = JobStage.VALIDATING
-        job.progress = 0
-        job.processed_rows = 0
-        job.attempts = 0
-        job.failure_reason = None
-        job.next_retry_at = None
-        job.next_run_at = None
-        job.locked_by = None
-        job.lease_until = None
-        job.output_result = {}
-        job.last_ran_at = timezone.now()
-        job.add_event(JobEventType.SUBMITTED, {"retried": True, "fromStatus": previous_status})
-        job.save()
-        JobTrigger.objects.create(tenant=request.user, job=job, triggered_at=timezone.now())
-        from .tasks import proc
-
-        transaction.on_commit(lambda: proc.delay(str(job.id)))
-        logger.info(
-            "job retry requested id=%s user=%s from_status=%s",
-            job.id,
-            request.user.id,
-            previous_status,
-        )
-        return api_response(JobSerializer(job).data)
+        with _jobs_per_min_slot(request.user):
+            previous_status = job.status
+            job.status = JobStatus.PENDING
+            job.stage = JobStage.VALIDATING
+            job.progress = 0
+            job.processed_rows = 0
+            job.attempts = 0
+            job.failure_reason = None
+            job.next_retry_at = None
+            job.next_run_at = None
+            job.locked_by = None
+            job.lease_until = None
+            job.output_result = {}
+            job.last_ran_at = timezone.now()
+            job.add_event(JobEventType.SUBMITTED, {"retried": True, "fromStatus": previous_status})
+            job.save(update_fields=[*_RESET_FIELDS, "output_result"])
+            _invalidate_stats(request.user)
+            JobTrigger.objects.create(tenant=request.user, job=job, triggered_at=timezone.now())
+            transaction.on_commit(lambda: proc.delay(str(job.id)))
+            logger.info(
+                "job retry requested id=%s user=%s from_status=%s",
+                job.id,
+                request.user.id,
+                previous_status,
+            )
+            return api_response(JobDetailSerializer(job).data)
 
     @action(detail=True, methods=["post"])
     def replay(self, request, pk=None):
         job = self.get_object()
         if job.status != JobStatus.DLQ:
             raise exceptions.ValidationError("Only DLQ jobs can be replayed.")
-        _enforce_jobs_per_min_limit(request.user)
-        job.status = JobStatus.PENDING
-        job.stage = JobStage.VALIDATING
-        job.progress = 0
-        job.processed_rows = 0
-        job.attempts = 0
-        job.failure_reason = None
-        job.next_retry_at = None
-        job.next_run_at = None
-        job.locked_by = None
-        job.lease_until = None
-        job.last_ran_at = timezone.now()
-        job.add_event(JobEventType.SUBMITTED, {"replayed": True})
-        job.save()
-        from .tasks import proc
-
-        transaction.on_commit(lambda: proc.delay(str(job.id)))
-        logger.info(
-            "job replay requested id=%s user=%s",
-            job.id,
-            request.user.id,
-        )
-        return api_response(JobSerializer(job).data)
+        with _jobs_per_min_slot(request.user):
+            job.status = JobStatus.PENDING
+            job.stage = JobStage.VALIDATING
+            job.progress = 0
+            job.processed_rows = 0
+            job.attempts = 0
+            job.failure_reason = None
+            job.next_retry_at = None
+            job.next_run_at = None
+            job.locked_by = None
+            job.lease_until = None
+            job.last_ran_at = timezone.now()
+            job.add_event(JobEventType.SUBMITTED, {"replayed": True})
+            job.save(update_fields=_RESET_FIELDS)
+            _invalidate_stats(request.user)
+            transaction.on_commit(lambda: proc.delay(str(job.id)))
+            logger.info(
+                "job replay requested id=%s user=%s",
+                job.id,
+                request.user.id,
+            )
+            return api_response(JobDetailSerializer(job).data)
 
     @action(detail=False, methods=["get"])
     def stats(self, request):
+        timeout = getattr(settings, "JOB_STATS_CACHE_SECONDS", 3)
+        if not timeout:
+            return api_response(self._compute_stats(request))
+        status_param = (request.query_params.get("status") or "").upper()
+        if status_param not in JobStatus.values:
+            status_param = ""
+        data = cache.get_or_set(
+            _stats_cache_key(request.user.id, status_param),
+            lambda: self._compute_stats(request),
+            timeout,
+        )
+        return api_response(data)
+
+    def _compute_stats(self, request) -> dict:
         qs = self.get_queryset()
         now = timezone.now()
         one_minute_ago = now - timedelta(minutes=1)
-        jobs_per_min = JobTrigger.objects.filter(
-            tenant=request.user, triggered_at__gte=one_minute_ago
-        ).count()
-        concurrent_jobs = qs.filter(status=JobStatus.RUNNING).count()
-        total_jobs = qs.count()
-        retry_total = qs.aggregate(total=Sum("attempts")).get("total") or 0
-        data = {
-            "totalJobs": total_jobs,
-            "pending": qs.filter(status=JobStatus.PENDING).count(),
-            "throttled": qs.filter(status=JobStatus.THROTTLED).count(),
-            "running": qs.filter(status=JobStatus.RUNNING).count(),
-            "done": qs.filter(status=JobStatus.DONE).count(),
-            "failed": qs.filter(status=JobStatus.FAILED).count(),
-            "dlq": qs.filter(status=JobStatus.DLQ).count(),
-            "retries": retry_total,
+        jobs_per_min = JobTrigger.window_usage(request.user, one_minute_ago)["used"]
+        counts = qs.aggregate(
+            total=Count("id"),
+            pending=Count("id", filter=Q(status=JobStatus.PENDING)),
+            throttled=Count("id", filter=Q(status=JobStatus.THROTTLED)),
+            running=Count("id", filter=Q(status=JobStatus.RUNNING)),
+            done=Count("id", filter=Q(status=JobStatus.DONE)),
+            failed=Count("id", filter=Q(status=JobStatus.FAILED)),
+            dlq=Count("id", filter=Q(status=JobStatus.DLQ)),
+            retries=Sum("attempts"),
+        )
+        return {
+            "totalJobs": counts["total"],
+            "pending": counts["pending"],
+            "throttled": counts["throttled"],
+            "running": counts["running"],
+            "done": counts["done"],
+            "failed": counts["failed"],
+            "dlq": counts["dlq"],
+            "retries": counts["retries"] or 0,
             "jobsPerMin": jobs_per_min,
             "jobsPerMinLimit": getattr(settings, "JOBS_PER_MIN_LIMIT", 4),
-            "concurrentJobs": concurrent_jobs,
+            "concurrentJobs": counts["running"],
             "concurrentJobsLimit": getattr(settings, "CONCURRENT_JOBS_LIMIT", 2),
         }
-        return api_response(data)
 
     @action(detail=False, methods=["post"])
     def lease(self, request):
@@ -371,39 +546,49 @@ class JobViewSet(viewsets.GenericViewSet):
         lease_seconds = data.get("lease_seconds", 120)
 
         concurrent_limit = getattr(settings, "CONCURRENT_JOBS_LIMIT", 2)
-        if (
-            concurrent_limit
-            and Job.objects.filter(tenant=request.user, status=JobStatus.RUNNING).count()
-            >= concurrent_limit
-        ):
-            raise exceptions.Throttled(
-                wait=5,
-                detail=f"Concurrent job limit reached ({concurrent_limit}). Try again shortly.",
+        with transaction.atomic():
+            if concurrent_limit:
+                # Serialise leases per tenant so two workers cannot both pass the RUNNING count.
+                list(
+                    User.objects.select_for_update()
+                    .filter(pk=request.user.pk)
+                    .values_list("pk", flat=True)
+                )
+                running = Job.objects.filter(
+                    tenant=request.user, status=JobStatus.RUNNING
+                ).count()
+                if running >= concurrent_limit:
+                    raise exceptions.Throttled(
+                        wait=5,
+                        detail=f"Concurrent job limit reached ({concurrent_limit}). Try again shortly.",
+                    )
+
+            now = timezone.now()
+            # Pick jobs where status in (PENDING, THROTTLED) and (next_run_at is null or next_run_at <= now);
+            # rows another transaction is leasing are skipped rather than waited on.
+            job = (
+                Job.objects.select_for_update(skip_locked=True)
+                .filter(tenant=request.user)
+                .filter(status__in=(JobStatus.PENDING, JobStatus.THROTTLED))
+                .filter(Q(next_run_at__isnull=True) | Q(next_run_at__lte=now))
+                .order_by("created_at")
+                .first()
             )
-
-        now = timezone.now()
-        # Pick jobs where status in (PENDING, THROTTLED) and (next_run_at is null or next_run_at <= now)
-        job = (
-            Job.objects.filter(tenant=request.user)
-            .filter(status__in=(JobStatus.PENDING, JobStatus.THROTTLED))
-            .filter(Q(next_run_at__isnull=True) | Q(next_run_at__lte=now))
-            .order_by("created_at")
-            .first()
-        )
-        if not job:
-            return api_response({"message": "No pending or throttled jobs available."})
-
-        job.status = JobStatus.RUNNING
-        job.stage = JobStage.PROCESSING
-        job.progress = max(job.progress, 5)
-        job.processed_rows = max(job.processed_rows, int(job.total_rows * 0.05))
-        job.locked_by = worker_id
-        job.last_ran_at = timezone.now()
-        job.lease_until = timezone.now() + timedelta(seconds=lease_seconds)
-        job.next_run_at = None
-        job.add_event(JobEventType.LEASED, {"worker": worker_id})
-        job.save()
-        return api_response(JobSerializer(job).data)
+            if not job:
+                return api_response({"message": "No pending or throttled jobs available."})
+
+            job.status = JobStatus.RUNNING
+            job.stage = JobStage.PROCESSING
+            job.progress = max(job.progress, 5)
+            job.processed_rows = max(job.processed_rows, int(job.total_rows * 0.05))
+            job.locked_by = worker_id
+            job.last_ran_at = timezone.now()
+            job.lease_until = timezone.now() + timedelta(seconds=lease_seconds)
+            job.next_run_at = None
+            job.add_event(JobEventType.LEASED, {"worker": worker_id})
+            job.save(update_fields=_LEASE_FIELDS)
+            _invalidate_stats(request.user)
+        return api_response(JobDetailSerializer(job).data)
 
     @action(detail=True, methods=["post"])
     def progress(self, request, pk=None):
@@ -417,8 +602,8 @@ class JobViewSet(viewsets.GenericViewSet):
         if "stage" in data:
             job.stage = data["stage"]
         job.add_event(JobEventType.PROGRESS_UPDATED, {"progress": job.progress})
-        job.save()
-        return api_response(JobSerializer(job).data)
+        job.save(update_fields=_PROGRESS_FIELDS)
+        return api_response(JobWorkerSerializer(job).data)
 
     @action(detail=True, methods=["post"])
     def complete(self, request, pk=None):
@@ -432,11 +617,12 @@ class JobViewSet(viewsets.GenericViewSet):
         job.locked_by = None
         job.lease_until = None
         output_result = serializer.validated_data.get("output_result")
-        job.output_result = output_result or build_output_result(job.input_payload or {})
+        job.output_result = output_result or build_output_result(job.load_input_payload())
         job.add_event(JobEventType.DONE)
-        job.save()
+        job.save(update_fields=_COMPLETE_FIELDS)
+        _invalidate_stats(request.user)
         logger.info("job completed id=%s user=%s", job.id, request.user.id)
-        return api_response(JobSerializer(job).data)
+        return api_response(JobWorkerSerializer(job).data)
 
     @action(detail=True, methods=["post"])
     def fail(self, request, pk=None):
@@ -474,7 +660,8 @@ class JobViewSet(viewsets.GenericViewSet):
                 {"nextRetryAt": job.next_retry_at.isoformat()},
             )
 
-        job.save()
+        job.save(update_fields=_FAIL_FIELDS)
+        _invalidate_stats(request.user)
         logger.info(
             "job failed id=%s user=%s status=%s attempts=%s reason=%s next_retry_at=%s",
             job.id,
@@ -484,7 +671,7 @@ class JobViewSet(viewsets.GenericViewSet):
             job.failure_reason,
             job.next_retry_at,
         )
-        return api_response(JobSerializer(job).data)
+        return api_response(JobWorkerSerializer(job).data)
 
     @action(detail=True, methods=["post"])
     def force_fail(self, request, pk=None):
@@ -526,7 +713,8 @@ class JobViewSet(viewsets.GenericViewSet):
                 {"nextRetryAt": job.next_retry_at.isoformat(), "manual": True},
             )
 
-        job.save()
+        job.save(update_fields=_FAIL_FIELDS)
+        _invalidate_stats(request.user)
         logger.info(
             "job failed manually id=%s user=%s status=%s attempts=%s reason=%s next_retry_at=%s",
             job.id,
@@ -536,4 +724,4 @@ class JobViewSet(viewsets.GenericViewSet):
             job.failure_reason,
             job.next_retry_at,
         )
-        return api_response(JobSerializer(job).data)
+        return api_response(JobDetailSerializer(job).data)
@@ -107,6 +107,8 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 JOBS_PER_MIN_LIMIT = int(os.getenv("JOBS_PER_MIN_LIMIT", "4"))
 CONCURRENT_JOBS_LIMIT = int(os.getenv("CONCURRENT_JOBS_LIMIT", "2"))
+# Empty keeps the per-minute window in the database (JobTrigger).
+JOBS_RATE_LIMIT_REDIS_URL = os.getenv("JOBS_RATE_LIMIT_REDIS_URL", "")
 
 CORS_ALLOWED_ORIGINS = [
     origin.strip()
@@ -132,6 +134,16 @@ REST_FRAMEWORK = {
     "EXCEPTION_HANDLER": "jobs.exceptions.custom_exception_handler",
 }
 
+# Shared cache for per-tenant stats; falls back to per-process memory without Redis.
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "")
+CACHES = {
+    "default": (
+        {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": CACHE_REDIS_URL}
+        if CACHE_REDIS_URL
+        else {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    )
+}
+
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", CELERY_BROKER_URL)
 CELERY_ACCEPT_CONTENT = ["json"]
@@ -150,6 +162,8 @@ JOB_RETRY_DELAY_SECONDS = int(os.getenv("JOB_RETRY_DELAY_SECONDS", "5"))
 JOB_THROTTLE_BACKOFF_SECONDS = int(os.getenv("JOB_THROTTLE_BACKOFF_SECONDS", "15"))
 JOB_PENDING_TIMEOUT_SECONDS = int(os.getenv("JOB_PENDING_TIMEOUT_SECONDS", "10"))
 JOB_RETRY_SCAN_SECONDS = int(os.getenv("JOB_RETRY_SCAN_SECONDS", "5"))
+JOB_STATS_CACHE_SECONDS = int(os.getenv("JOB_STATS_CACHE_SECONDS", "3"))
+JOB_TRIGGER_RETENTION_SECONDS = int(os.getenv("JOB_TRIGGER_RETENTION_SECONDS", "3600"))
 JOB_JSON_ROW_DELAY_MIN_SECONDS = float(
     os.getenv("JOB_JSON_ROW_DELAY_MIN_SECONDS", "2")
 )
@@ -163,6 +177,10 @@ JOB_CSV_BATCH_DELAY_SECONDS = float(
 JOB_CSV_TARGET_ROWS = int(os.getenv("JOB_CSV_TARGET_ROWS", "50000"))
 JOB_CSV_TARGET_SECONDS = float(os.getenv("JOB_CSV_TARGET_SECONDS", "15"))
 JOB_CSV_PROGRESS_UPDATES = int(os.getenv("JOB_CSV_PROGRESS_UPDATES", "100"))
+JOB_ABORT_POLL_SECONDS = float(os.getenv("JOB_ABORT_POLL_SECONDS", "1"))
+JOB_PROGRESS_MIN_INTERVAL_SECONDS = float(
+    os.getenv("JOB_PROGRESS_MIN_INTERVAL_SECONDS", "1")
+)
 JOB_MIN_RUNNING_SECONDS = float(os.getenv("JOB_MIN_RUNNING_SECONDS", "6"))
 
 CELERY_BEAT_SCHEDULE = {